@@ -1,10 +1,31 @@
 import streamlit as st
-from pgs.home_page import show_home_page
-from pgs.company_page import show_company_page
-from pgs.executive_detail import show_executive_detail
+import importlib
 import json
+import os
 st.set_page_config(layout="wide")
 
+@st.cache_resource
+def start_market_warmup():
+    """Start the daily market-data refresher once per server process."""
+    from market.warmup import start_background_refresher
+    return start_background_refresher()
+
+if os.environ.get('STICKYNOTE_WARMUP') == '1':
+    start_market_warmup()
+
+# Pages are imported on first visit, so the login screen doesn't pay for
+# pandas, plotly and the market-data stack.
+PAGES = {
+    'home': ('pgs.home_page', 'show_home_page'),
+    'executive_detail': ('pgs.executive_detail', 'show_executive_detail'),
+    'company_page': ('pgs.company_page', 'show_company_page'),
+    'leaderboard': ('pgs.leaderboard', 'show_leaderboard'),
+}
+
+def show_page(page):
+    module, function = PAGES.get(page, PAGES['company_page'])
+    getattr(importlib.import_module(module), function)()
+
 def load_sp500_companies():
     """Load S&P 500 companies from the JSON file."""
     with open('sp500_companies.json', 'r') as file:
@@ -45,10 +66,5 @@ if check_password():
         st.session_state['page'] = 'home'
     
     # Show appropriate page based on session state
-    if st.session_state['page'] == 'home':
-        show_home_page()
-    elif st.session_state['page'] == 'executive_detail':
-        show_executive_detail()
-    else:
-        show_company_page()
+    show_page(st.session_state['page'])
 
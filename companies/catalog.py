@@ -0,0 +1,135 @@
+import json
+import os
+import re
+from bisect import bisect_left
+from functools import lru_cache
+
+from settings import ROOT_DIR
+
+COMPANIES_PATH = os.environ.get('STICKYNOTE_COMPANIES_FILE', os.path.join(ROOT_DIR, 'sp500_companies.json'))
+SEARCH_LIMIT = 50
+_TOKEN = re.compile(r"[a-z0-9]+")
+_TICKER = re.compile(r"[a-z0-9.\-]+")
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+def _deletions(token):
+    """``token`` with each single character removed; two words within one edit share a variant."""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+class CompanyCatalog:
+    """The tradable companies the app knows about, indexed for type-ahead search.
+
+    ``names`` maps ticker to company name in file order, ``labels`` ticker to
+    the ``"TICKER - Name"`` display string and ``tickers`` lists tickers
+    sorted by label. ``search`` matches tickers by prefix through a trie
+    and company names by word: exact, prefix, or within one typo for words
+    of four or more letters.
+    """
+
+    def __init__(self, companies):
+        self.names = dict(companies)
+        self.labels = {ticker: f"{ticker} - {name}" for ticker, name in self.names.items()}
+        self.tickers = sorted(self.labels, key=self.labels.__getitem__)
+        self._rank = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+        self._trie = {}
+        for ticker in self.tickers:
+            node = self._trie
+            for ch in ticker.lower():
+                node = node.setdefault(ch, {})
+            node.setdefault('', []).append(ticker)
+
+        self._postings = {}  # token -> tickers whose name contains it
+        for ticker, name in self.names.items():
+            for token in set(tokenize(name)):
+                self._postings.setdefault(token, []).append(ticker)
+        self._tokens = sorted(self._postings)
+        self._typos = {}  # deletion variant -> tokens
+        for token in self._tokens:
+            if len(token) >= 4:
+                for variant in _deletions(token) | {token}:
+                    self._typos.setdefault(variant, []).append(token)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, ticker):
+        return ticker in self.names
+
+    def ticker_prefix(self, prefix):
+        """Tickers starting with ``prefix``, in label order."""
+        node = self._trie
+        for ch in prefix.lower():
+            node = node.get(ch)
+            if node is None:
+                return []
+        found, stack = [], [node]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key == '':
+                    found.extend(child)
+                else:
+                    stack.append(child)
+        return sorted(found, key=self._rank.__getitem__)
+
+    def _token_matches(self, word):
+        """``{token: score}`` for name words matching ``word``: 3 exact, 2 prefix, 1 one typo away."""
+        matches = {}
+        i = bisect_left(self._tokens, word)
+        while i < len(self._tokens) and self._tokens[i].startswith(word):
+            token = self._tokens[i]
+            matches[token] = 3 if token == word else 2
+            i += 1
+        if len(word) >= 4:
+            for variant in _deletions(word) | {word}:
+                for token in self._typos.get(variant, ()):
+                    matches.setdefault(token, 1)
+        return matches
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Tickers matching ``query``, best first.
+
+        An exact ticker ranks first, then ticker prefixes, then companies whose
+        name matches every word of the query (stronger word matches first).
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        scores = {}
+        # Tickers can contain '.' or '-' (BRK.B), which tokenize() splits on.
+        raw = query.strip().lower()
+        if _TICKER.fullmatch(raw):
+            for ticker in self.ticker_prefix(raw):
+                scores[ticker] = 10 if ticker.lower() == raw else 5
+        name_scores = None
+        for word in words:
+            word_scores = {}
+            for token, score in self._token_matches(word).items():
+                for ticker in self._postings[token]:
+                    word_scores[ticker] = max(word_scores.get(ticker, 0), score)
+            if name_scores is None:
+                name_scores = word_scores
+            else:
+                name_scores = {t: s + word_scores[t] for t, s in name_scores.items() if t in word_scores}
+        for ticker, score in name_scores.items():
+            scores[ticker] = max(scores.get(ticker, 0), score / len(words))
+        ranked = sorted(scores, key=lambda t: (-scores[t], self._rank[t]))
+        return ranked[:limit]
+
+
+@lru_cache(maxsize=4)
+def _load(path, version):
+    with open(path, 'r') as f:
+        return CompanyCatalog(json.load(f))
+
+
+def get_catalog(path=COMPANIES_PATH):
+    """The process-wide catalog, reloaded only when the companies file changes."""
+    st = os.stat(path)
+    return _load(path, (st.st_mtime_ns, st.st_size))
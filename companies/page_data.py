@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+PREFETCH_WORKERS = 8
+HISTORY_DAYS = 365  # the company page's default Stock Overview range
+
+_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='page-data')
+
+
+def default_history_range(today=None):
+    today = today or date.today()
+    return today - timedelta(days=HISTORY_DAYS), today
+
+
+def _info(ticker):
+    from market.cache import get_ticker_info
+    return get_ticker_info(ticker)
+
+
+def _quote(ticker):
+    from market.cache import get_quote
+    return get_quote(ticker)
+
+
+def _history(ticker, start, end):
+    from market.history import get_history
+    return get_history(ticker, start, end)
+
+
+def _directory(ticker):
+    from org.directory import get_directory
+    return get_directory(ticker)
+
+
+class CompanyPageData:
+    """Everything a company's pages need, loading concurrently from the moment it is created.
+
+    Each ``take_*`` method blocks only on its own future, so a section
+    renders as soon as its data arrives. A future is handed over once; later
+    calls (e.g. fragment reruns) go straight to the underlying caches, which
+    the prefetch has warmed, so long-lived sessions still see fresh data.
+    """
+
+    def __init__(self, ticker, history_range=None):
+        self.ticker = ticker.upper()
+        self.history_range = history_range or default_history_range()
+        self._lock = threading.Lock()
+        self._futures = {
+            'info': _pool.submit(_info, self.ticker),
+            'quote': _pool.submit(_quote, self.ticker),
+            'history': _pool.submit(_history, self.ticker, *self.history_range),
+            'directory': _pool.submit(_directory, self.ticker),
+        }
+
+    def _take(self, name, load, *args):
+        with self._lock:
+            future = self._futures.pop(name, None)
+        return future.result() if future is not None else load(*args)
+
+    def take_info(self):
+        return self._take('info', _info, self.ticker)
+
+    def take_quote(self):
+        return self._take('quote', _quote, self.ticker)
+
+    def take_directory(self):
+        return self._take('directory', _directory, self.ticker)
+
+    def take_history(self, start, end):
+        """Bars for ``[start, end)``; only the prefetched default range comes from the future."""
+        if (start, end) != self.history_range:
+            return _history(self.ticker, start, end)
+        return self._take('history', _history, self.ticker, start, end)
+
+
+def prefetch_company(ticker, history_range=None):
+    """Start loading ``ticker``'s page data in the background and return its CompanyPageData."""
+    return CompanyPageData(ticker, history_range)
@@ -0,0 +1,169 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from market.provider import get_provider
+from market.throttle import provider_gate
+from settings import CACHE_DIR
+from utils import LRUCache
+
+INFO_TTL = float(os.environ.get('STICKYNOTE_INFO_TTL', 15 * 60))
+INFO_STALE_TTL = float(os.environ.get('STICKYNOTE_INFO_STALE_TTL', 24 * 60 * 60))
+INFO_CACHE_SIZE = int(os.environ.get('STICKYNOTE_INFO_CACHE_SIZE', 600))
+
+QUOTE_TTL = float(os.environ.get('STICKYNOTE_QUOTE_TTL', 60))
+
+INFO_DIR = os.path.join(CACHE_DIR, 'info')
+QUOTE_DIR = os.path.join(CACHE_DIR, 'quote')
+
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='market-refresh')
+
+
+class JsonDiskStore:
+    """One JSON file per key, shared between processes (e.g. the warm-up job)."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.json')
+
+    def load(self, key):
+        """Return ``(saved_at, value)`` or None."""
+        try:
+            with open(self._path(key), 'r') as f:
+                record = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return record['saved_at'], record['value']
+
+    def save(self, key, value, saved_at):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f'{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'saved_at': saved_at, 'value': value}, f, default=str)
+        os.replace(tmp_path, self._path(key))
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a TTL and stale-while-revalidate.
+
+    Entries younger than ``ttl`` are served directly. Entries older than
+    ``ttl`` but younger than ``stale_ttl`` are served immediately while a
+    background refresh reloads them. Anything older (or missing) is loaded
+    synchronously. At most ``maxsize`` entries are kept, evicting the least
+    recently used. With a ``store``, loaded values are also written through
+    to it and a memory miss is first answered from it, so other processes
+    can pre-populate the cache.
+    """
+
+    def __init__(self, loader, ttl, stale_ttl, maxsize, store=None):
+        self.loader = loader
+        self.store = store
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.maxsize = maxsize
+        self._entries = LRUCache(maxsize)  # key -> (loaded_at, value)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0,
+            'errors': 0, 'evictions': 0, 'loads': 0, 'load_seconds': 0.0,
+        }
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def _load(self, key):
+        start = time.perf_counter()
+        try:
+            return self.loader(key)
+        finally:
+            with self._lock:
+                self._stats['loads'] += 1
+                self._stats['load_seconds'] += time.perf_counter() - start
+
+    def put(self, key, value, loaded_at=None, persist=True):
+        loaded_at = time.time() if loaded_at is None else loaded_at
+        if persist and self.store is not None:
+            self.store.save(key, value, loaded_at)
+        evicted = self._entries.put(key, (loaded_at, value))
+        if evicted:
+            self._count('evictions', evicted)
+
+    def _refresh(self, key):
+        try:
+            self.put(key, self._load(key))
+            self._count('refreshes')
+        except Exception:
+            self._count('errors')
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if self.store is not None and (entry is None or time.time() - entry[0] >= self.ttl):
+            # Another process (e.g. the warm-up job) may have stored a newer value.
+            stored = self.store.load(key)
+            if stored is not None and (entry is None or stored[0] > entry[0]):
+                entry = stored
+                self.put(key, entry[1], loaded_at=entry[0], persist=False)
+        if entry is not None:
+            age = time.time() - entry[0]
+            if age < self.ttl:
+                self._count('hits')
+                return entry[1]
+            if age < self.stale_ttl:
+                self._count('stale_hits')
+                with self._lock:
+                    start_refresh = key not in self._refreshing
+                    self._refreshing.add(key)
+                if start_refresh:
+                    _refresh_pool.submit(self._refresh, key)
+                return entry[1]
+        self._count('misses')
+        try:
+            value = self._load(key)
+        except Exception:
+            self._count('errors')
+            raise
+        self.put(key, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, size=len(self._entries))
+        stats['avg_load_ms'] = 1000 * stats['load_seconds'] / stats['loads'] if stats['loads'] else 0.0
+        return stats
+
+
+def _fetch_info(ticker):
+    return provider_gate.call(('info', ticker), get_provider().info, ticker)
+
+
+def _fetch_quote(ticker):
+    return provider_gate.call(('quote', ticker), get_provider().quote, ticker)
+
+
+info_cache = TTLCache(
+    _fetch_info, ttl=INFO_TTL, stale_ttl=INFO_STALE_TTL, maxsize=INFO_CACHE_SIZE, store=JsonDiskStore(INFO_DIR)
+)
+
+
+quote_cache = TTLCache(
+    _fetch_quote, ttl=QUOTE_TTL, stale_ttl=INFO_TTL, maxsize=INFO_CACHE_SIZE, store=JsonDiskStore(QUOTE_DIR)
+)
+
+
+def get_ticker_info(ticker):
+    """Return the provider's company info for ``ticker`` through the process-wide cache."""
+    return info_cache.get(ticker.upper())
+
+
+def get_quote(ticker):
+    """Return the provider's latest quote for ``ticker`` through the process-wide cache."""
+    return quote_cache.get(ticker.upper())
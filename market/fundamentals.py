@@ -0,0 +1,130 @@
+"""Columnar fundamentals table for every ticker in the company catalog.
+
+    python -m market.fundamentals            # rebuild from the stored info
+    python -m market.fundamentals --fetch    # fetch missing info first
+
+The table is built from the info records the warm-up job stores on disk, so
+reading it never calls the provider. Columns are saved as numpy arrays in
+``CACHE_DIR/fundamentals.npz``; ``compute_metrics`` derives the company
+page's ratios for all rows at once.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from companies.catalog import get_catalog
+from market.cache import info_cache
+from org.directory import get_directory
+from settings import CACHE_DIR
+
+FUNDAMENTALS_PATH = os.path.join(CACHE_DIR, 'fundamentals.npz')
+NUMERIC_FIELDS = [
+    'fullTimeEmployees', 'totalRevenue', 'profitMargins', 'operatingMargins', 'sharesOutstanding',
+    'marketCap', 'enterpriseValue', 'totalCash', 'dividendRate', 'firstTradeDateEpochUtc',
+]
+FETCH_WORKERS = 8
+METRICS = ['Revenue/Employee', 'Executive Ratio %', 'Profit Margin %', 'Operating Margin %', 'Avg Exec Comp']
+
+
+def _stored_info(ticker):
+    stored = info_cache.store.load(ticker)
+    return stored[1] if stored else None
+
+
+def build_fundamentals(tickers=None, path=FUNDAMENTALS_PATH, fetch=False, workers=FETCH_WORKERS):
+    """Collect info for ``tickers`` (default: the whole catalog) into the columnar table at ``path``.
+
+    Without ``fetch`` only info already on disk is used; with it, missing
+    records are fetched through the shared info cache. Returns the table as a DataFrame.
+    """
+    catalog = get_catalog()
+    tickers = [t.upper() for t in (tickers or catalog.names)]
+    load = info_cache.get if fetch else _stored_info
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fundamentals') as pool:
+        infos = list(pool.map(lambda t: _try(load, t), tickers))
+
+    columns = {
+        'ticker': np.array(tickers, dtype=str),
+        'name': np.array([catalog.names.get(t, t) for t in tickers], dtype=str),
+        'executives': np.array([_executive_count(t) for t in tickers], dtype=float),
+    }
+    for field in NUMERIC_FIELDS:
+        columns[field] = np.array([_number((info or {}).get(field)) for info in infos], dtype=float)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+    np.savez(tmp_path, built_at=np.array(time.time()), **columns)
+    os.replace(tmp_path, path)
+    return pd.DataFrame(columns)
+
+
+def _try(load, ticker):
+    try:
+        return load(ticker)
+    except Exception:
+        return None
+
+
+def _executive_count(ticker):
+    directory = get_directory(ticker)
+    return len(directory) if directory else np.nan
+
+
+def _number(value):
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+
+
+@lru_cache(maxsize=2)
+def _load(path, version):
+    with np.load(path) as data:
+        built_at = float(data['built_at'])
+        frame = pd.DataFrame({name: data[name] for name in data.files if name != 'built_at'})
+    frame.attrs['built_at'] = built_at
+    return frame
+
+
+def load_fundamentals(path=FUNDAMENTALS_PATH):
+    """The fundamentals table as a DataFrame (read once per file version), or None if it hasn't been built."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return _load(path, (st.st_mtime_ns, st.st_size))
+
+
+def compute_metrics(table):
+    """Add the company page's derived metrics and their percentile ranks (``<metric> pct``), vectorized.
+
+    Ratios with a missing or zero denominator are NaN and left unranked.
+    """
+    employees = table['fullTimeEmployees'].where(table['fullTimeEmployees'] > 0)
+    executives = table['executives'].where(table['executives'] > 0)
+    out = table.copy()
+    out['Revenue/Employee'] = table['totalRevenue'] / employees
+    out['Executive Ratio %'] = executives / employees * 100
+    out['Profit Margin %'] = table['profitMargins'] * 100
+    out['Operating Margin %'] = table['operatingMargins'] * 100
+    out['Avg Exec Comp'] = table['totalCash'] / executives
+    for metric in METRICS:
+        out[f'{metric} pct'] = out[metric].rank(pct=True) * 100
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the columnar fundamentals table.")
+    parser.add_argument('tickers', nargs='*', help="Tickers to include (default: the whole catalog)")
+    parser.add_argument('--fetch', action='store_true', help="Fetch info that isn't stored yet")
+    args = parser.parse_args(argv)
+    table = build_fundamentals(args.tickers or None, fetch=args.fetch)
+    have = int(table['totalRevenue'].notna().sum())
+    print(f"Wrote {len(table)} tickers ({have} with fundamentals) to {FUNDAMENTALS_PATH}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+from market.provider import get_provider
+from market.throttle import provider_gate
+from settings import CACHE_DIR
+
+HISTORY_DIR = os.path.join(CACHE_DIR, 'history')
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+BAR_DTYPE = np.dtype([('day', 'i8')] + [(c, 'f8') for c in COLUMNS])
+EPOCH = date(1970, 1, 1)
+MAX_EMPTY_GAP_DAYS = 4
+CHART_MAX_POINTS = int(os.environ.get('STICKYNOTE_CHART_MAX_POINTS', 300))
+# (interval, pandas rule, approximate days per bar), finest first; bars are labelled with the start of their period.
+RESAMPLE_RULES = [('Daily', None, 1), ('Weekly', 'W-MON', 7), ('Monthly', 'MS', 30.44)]
+OHLCV_AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def _day(d):
+    return (pd.Timestamp(d).date() - EPOCH).days
+
+
+def _subtract(start, end, ranges):
+    """Parts of [start, end) not covered by the sorted, disjoint ``ranges``."""
+    gaps = []
+    for lo, hi in ranges:
+        if hi <= start or lo >= end:
+            continue
+        if lo > start:
+            gaps.append((start, lo))
+        start = max(start, hi)
+    if start < end:
+        gaps.append((start, end))
+    return gaps
+
+
+def _union(ranges):
+    merged = []
+    for lo, hi in sorted(ranges):
+        if merged and lo <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+    return merged
+
+
+def _fetch_history(ticker, start, end):
+    return provider_gate.call(('history', ticker, start, end), get_provider().history, ticker, start, end)
+
+
+class HistoryStore:
+    """Per-ticker daily OHLCV bars cached on disk.
+
+    Each ticker is one ``<TICKER>.npz`` holding the bars (a structured array
+    sorted by day) together with the day ranges already fetched, so the two
+    can never disagree. A request only fetches the gaps it is missing and is
+    otherwise served by slicing. Past days are final; the day a range was
+    fetched on (``as_of``) is refetched once on a later day so the last,
+    possibly partial, bar is corrected. Read-merge-write runs under an
+    exclusive ``flock`` on ``<TICKER>.lock``, so the warm-up job and the app
+    can share the directory.
+    """
+
+    def __init__(self, directory=HISTORY_DIR, fetch=_fetch_history):
+        self.directory = directory
+        self.fetch = fetch
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    @contextmanager
+    def _locked(self, ticker):
+        with self._locks_guard:
+            mutex = self._locks.setdefault(ticker, threading.Lock())
+        with mutex:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, ticker + '.lock'), 'a') as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _path(self, ticker):
+        return os.path.join(self.directory, ticker + '.npz')
+
+    def _read(self, ticker):
+        try:
+            with np.load(self._path(ticker)) as data:
+                return json.loads(str(data['meta'])), data['bars']
+        except (FileNotFoundError, ValueError, KeyError):
+            return {'ranges': [], 'as_of': None, 'tz': None}, np.empty(0, dtype=BAR_DTYPE)
+
+    def _write(self, ticker, meta, bars):
+        path = self._path(ticker)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, bars=bars, meta=np.array(json.dumps(meta)))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _to_bars(frame):
+        bars = np.empty(len(frame), dtype=BAR_DTYPE)
+        if len(frame):
+            index = frame.index.tz_localize(None) if frame.index.tz is not None else frame.index
+            bars['day'] = index.normalize().values.astype('datetime64[D]').astype('i8')
+            for column in COLUMNS:
+                bars[column] = frame[column].to_numpy(dtype='f8')
+        return bars
+
+    def _load_ranges(self, ticker):
+        meta, bars = self._read(ticker)
+        ranges = meta['ranges']
+        if meta['as_of'] is not None and meta['as_of'] < _day(date.today()):
+            # The as_of day may hold a partial bar; treat it as not yet fetched.
+            ranges = [[lo, min(hi, meta['as_of'])] for lo, hi in ranges if lo < meta['as_of']]
+        return meta, ranges, bars
+
+    def _merge(self, ticker, meta, ranges, bars, pieces):
+        """Merge fetched ``(lo, hi, frame)`` pieces into the stored bars and persist."""
+        for lo, hi, frame in pieces:
+            if len(frame) and frame.index.tz is not None:
+                meta['tz'] = str(frame.index.tz)
+        new = np.concatenate([self._to_bars(frame) for _, _, frame in pieces])
+        old = np.asarray(bars)
+        old = old[~np.isin(old['day'], new['day'])]
+        bars = np.concatenate([old, new])
+        bars = bars[np.argsort(bars['day'], kind='stable')]
+        first_day = bars['day'][0] if len(bars) else None
+        filled = []
+        for lo, hi, frame in pieces:
+            # Nothing before the first bar means the ticker wasn't listed yet.
+            # Between known bars, an empty answer for more than a long weekend
+            # is more likely a provider failure than a real gap, so leave it unfilled.
+            if len(frame) or hi - lo <= MAX_EMPTY_GAP_DAYS or (first_day is not None and hi <= first_day):
+                filled.append([lo, hi])
+        meta['ranges'] = _union(ranges + filled)
+        meta['as_of'] = _day(date.today())
+        self._write(ticker, meta, bars)
+        return bars
+
+    def ingest(self, ticker, frame, start, end):
+        """Store bars fetched elsewhere (e.g. a bulk download) covering ``[start, end)``."""
+        ticker = ticker.upper()
+        start_day = _day(start)
+        end_day = min(_day(end), _day(date.today()) + 1)
+        with self._locked(ticker):
+            meta, ranges, bars = self._load_ranges(ticker)
+            self._merge(ticker, meta, ranges, bars, [(start_day, end_day, frame)])
+
+    def get(self, ticker, start, end):
+        """Daily bars for ``[start, end)`` as a DataFrame like ``Ticker.history``."""
+        ticker = ticker.upper()
+        start_day = _day(start)
+        end_day = min(_day(end), _day(date.today()) + 1)
+        with self._locked(ticker):
+            meta, ranges, bars = self._load_ranges(ticker)
+            gaps = _subtract(start_day, end_day, ranges)
+            if gaps:
+                pieces = [
+                    (lo, hi, self.fetch(ticker, EPOCH + timedelta(days=lo), EPOCH + timedelta(days=hi)))
+                    for lo, hi in gaps
+                ]
+                bars = self._merge(ticker, meta, ranges, bars, pieces)
+        lo, hi = np.searchsorted(bars['day'], [start_day, end_day])
+        window = bars[lo:hi]
+        index = pd.to_datetime(window['day'], unit='D')
+        if meta['tz']:
+            index = index.tz_localize(meta['tz'])
+        return pd.DataFrame({c: np.array(window[c]) for c in COLUMNS}, index=pd.DatetimeIndex(index, name='Date'))
+
+history_store = HistoryStore()
+
+
+def get_history(ticker, start, end):
+    """Daily OHLCV bars for ``[start, end)`` from the shared on-disk store."""
+    return history_store.get(ticker, start, end)
+
+
+def downsample_ohlc(frame, max_points=CHART_MAX_POINTS):
+    """Resample daily bars to the finest of daily/weekly/monthly that fits ``max_points``.
+
+    The interval is chosen from the frame's length and calendar span, so at
+    most one resample runs. Returns ``(bars, interval)`` where ``interval``
+    is "Daily", "Weekly" or "Monthly". Opens and closes are the first and
+    last of each period, highs/lows its extremes and volume the sum. Use the
+    original frame for metrics; this is only for drawing.
+    """
+    if len(frame) <= max_points:
+        return frame, 'Daily'
+    span_days = (frame.index[-1] - frame.index[0]).days + 1
+    for interval, rule, days_per_bar in RESAMPLE_RULES[1:]:
+        if span_days / days_per_bar <= max_points:
+            break
+    bars = frame.resample(rule, label='left', closed='left').agg(OHLCV_AGG).dropna(subset=['Open'])
+    return bars, interval
@@ -0,0 +1,223 @@
+"""Market-data providers.
+
+Every remote market-data call in the app goes through ``get_provider()``.
+``STICKYNOTE_MARKET_PROVIDER`` selects the implementation:
+
+* ``yfinance`` (default): live data from Yahoo Finance.
+* ``fixture``: replays responses saved under ``STICKYNOTE_FIXTURE_DIR``;
+  with ``STICKYNOTE_FIXTURE_RECORD=1`` misses are fetched from yfinance and saved.
+* ``synthetic``: deterministic, realistic-looking data for any ticker, no network.
+
+numpy and pandas are imported inside the methods that need them, so quote
+lookups don't load them up front.
+"""
+import json
+import os
+import zlib
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+from settings import CACHE_DIR
+
+MARKET_PROVIDER = os.environ.get('STICKYNOTE_MARKET_PROVIDER', 'yfinance')
+FIXTURE_DIR = os.environ.get('STICKYNOTE_FIXTURE_DIR', os.path.join(CACHE_DIR, 'fixtures'))
+FIXTURE_RECORD = os.environ.get('STICKYNOTE_FIXTURE_RECORD') == '1'
+OHLCV = ['Open', 'High', 'Low', 'Close', 'Volume']
+MARKET_TZ = 'America/New_York'
+
+
+def _market_time(value):
+    import pandas as pd
+    ts = pd.Timestamp(value)
+    return ts.tz_localize(MARKET_TZ) if ts.tz is None else ts.tz_convert(MARKET_TZ)
+
+
+class MarketDataProvider:
+    """Source of company info, quotes and daily OHLCV history."""
+
+    def info(self, ticker):
+        """Company profile and fundamentals, shaped like ``yf.Ticker(t).info``."""
+        raise NotImplementedError
+
+    def quote(self, ticker):
+        """Latest price as ``{'price', 'previous_close', 'currency'}``."""
+        raise NotImplementedError
+
+    def history(self, ticker, start, end):
+        """Daily OHLCV bars for ``[start, end)`` indexed by date."""
+        raise NotImplementedError
+
+    def history_batch(self, tickers, start, end):
+        """``{ticker: bars}`` for several tickers; providers may do this in one request."""
+        return {ticker: self.history(ticker, start, end) for ticker in tickers}
+
+
+class YFinanceProvider(MarketDataProvider):
+    def info(self, ticker):
+        import yfinance as yf
+        return yf.Ticker(ticker).info
+
+    def quote(self, ticker):
+        import yfinance as yf
+        fast = yf.Ticker(ticker).fast_info
+        return {'price': fast.last_price, 'previous_close': fast.previous_close, 'currency': fast.currency}
+
+    def history(self, ticker, start, end):
+        import yfinance as yf
+        return yf.Ticker(ticker).history(start=start, end=end)
+
+    def history_batch(self, tickers, start, end):
+        import pandas as pd
+        import yfinance as yf
+        data = yf.download(
+            list(tickers), start=start, end=end, group_by='ticker',
+            auto_adjust=True, threads=True, progress=False,
+        )
+        frames = {}
+        if data is None or data.empty:
+            return frames
+        for ticker in tickers:
+            if isinstance(data.columns, pd.MultiIndex):
+                if ticker not in data.columns.get_level_values(0):
+                    continue
+                frame = data[ticker]
+            else:
+                frame = data
+            frames[ticker] = frame.dropna(how='all', subset=['Open', 'High', 'Low', 'Close'])
+        return frames
+
+
+class FixtureProvider(MarketDataProvider):
+    """Replays responses saved as ``<dir>/<TICKER>/{info,quote}.json`` and ``history.csv``.
+
+    With an ``upstream`` provider, missing fixtures are fetched from it and
+    saved (record mode); without one a missing fixture raises ``KeyError``.
+    Recorded history covers whatever range was first requested.
+    """
+
+    def __init__(self, directory=FIXTURE_DIR, upstream=None):
+        self.directory = directory
+        self.upstream = upstream
+
+    def _path(self, ticker, name):
+        return os.path.join(self.directory, ticker.upper(), name)
+
+    def _json(self, ticker, name, fetch):
+        path = self._path(ticker, name)
+        if not os.path.exists(path):
+            if self.upstream is None:
+                raise KeyError(f"No {name} fixture for {ticker}")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(fetch(ticker), f, default=str)
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def info(self, ticker):
+        return self._json(ticker, 'info.json', lambda t: self.upstream.info(t))
+
+    def quote(self, ticker):
+        return self._json(ticker, 'quote.json', lambda t: self.upstream.quote(t))
+
+    def history(self, ticker, start, end):
+        import pandas as pd
+        path = self._path(ticker, 'history.csv')
+        if not os.path.exists(path):
+            if self.upstream is None:
+                raise KeyError(f"No history fixture for {ticker}")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.upstream.history(ticker, start, end)[OHLCV].to_csv(path)
+        frame = pd.read_csv(path, index_col=0)
+        frame.index = pd.to_datetime(frame.index, utc=True).tz_convert(MARKET_TZ)
+        frame.index.name = 'Date'
+        start, end = pd.Timestamp(start).date(), pd.Timestamp(end).date()
+        days = frame.index.date
+        return frame[(days >= start) & (days < end)]
+
+
+class SyntheticProvider(MarketDataProvider):
+    """Deterministic synthetic market data for any ticker.
+
+    Prices follow a geometric random walk seeded by the ticker, generated on
+    business days from 2000-01-03 to today, so any range request returns a
+    consistent slice of the same series. Fundamentals are drawn from
+    plausible large-cap ranges.
+    """
+
+    ANCHOR = date(2000, 1, 3)
+    PHI = 0.998
+
+    def __init__(self, seed=0):
+        self.seed = seed
+
+    def _rng(self, ticker, salt):
+        import numpy as np
+        return np.random.default_rng([zlib.crc32(ticker.upper().encode()), self.seed, salt])
+
+    @lru_cache(maxsize=64)
+    def _series(self, ticker, today):
+        import numpy as np
+        import pandas as pd
+        # One generator per column keeps earlier bars identical as days are appended.
+        params = self._rng(ticker, 1)
+        start_price = params.uniform(20, 250)
+        volatility = params.uniform(0.01, 0.025)
+        avg_volume = params.uniform(1e6, 2e7)
+        index = pd.bdate_range(self.ANCHOR, today, tz=MARKET_TZ, name='Date')
+        n = len(index)
+        # Log price is a slow drift plus a mean-reverting AR(1) term, written in
+        # closed form: x_t = phi^t * sum_k(e_k * phi^-k).
+        t = np.arange(n)
+        shocks = self._rng(ticker, 10).normal(0, volatility, n)
+        close = start_price * np.exp(0.00008 * t + self.PHI ** t * np.cumsum(shocks * self.PHI ** -t))
+        open_ = np.concatenate([[start_price], close[:-1]]) * np.exp(self._rng(ticker, 11).normal(0, 0.003, n))
+        spread = np.abs(self._rng(ticker, 12).normal(0, 0.01, n)) * close
+        high = np.maximum(open_, close) + spread
+        low = np.minimum(open_, close) - spread * self._rng(ticker, 13).uniform(0.5, 1.0, n)
+        volume = np.round(self._rng(ticker, 14).lognormal(np.log(avg_volume), 0.35, n))
+        return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}, index=index)
+
+    def history(self, ticker, start, end):
+        series = self._series(ticker.upper(), date.today())
+        return series[(series.index >= _market_time(start)) & (series.index < _market_time(end))]
+
+    def quote(self, ticker):
+        close = self._series(ticker.upper(), date.today())['Close']
+        return {'price': float(close.iloc[-1]), 'previous_close': float(close.iloc[-2]), 'currency': 'USD'}
+
+    def info(self, ticker):
+        rng = self._rng(ticker, 2)
+        quote = self.quote(ticker)
+        employees = int(rng.uniform(2e3, 3e5))
+        revenue = employees * rng.uniform(1.5e5, 1.5e6)
+        shares = rng.uniform(1e8, 5e9)
+        first_trade = datetime(int(rng.integers(1970, 2015)), 1, 2)
+        return {
+            'symbol': ticker.upper(),
+            'longName': f"{ticker.upper()} Synthetic Corp.",
+            'currency': 'USD',
+            'regularMarketPrice': quote['price'],
+            'previousClose': quote['previous_close'],
+            'fullTimeEmployees': employees,
+            'totalRevenue': revenue,
+            'profitMargins': rng.uniform(-0.05, 0.3),
+            'operatingMargins': rng.uniform(0.0, 0.4),
+            'sharesOutstanding': shares,
+            'marketCap': shares * quote['price'],
+            'enterpriseValue': shares * quote['price'] * rng.uniform(0.9, 1.3),
+            'totalCash': revenue * rng.uniform(0.05, 0.4),
+            'dividendRate': round(rng.uniform(0, 4), 2),
+            'firstTradeDateEpochUtc': int((first_trade - datetime(1970, 1, 1)) / timedelta(seconds=1)),
+        }
+
+
+@lru_cache(maxsize=None)
+def get_provider(name=MARKET_PROVIDER):
+    """Process-wide market-data provider selected by ``STICKYNOTE_MARKET_PROVIDER``."""
+    if name == 'yfinance':
+        return YFinanceProvider()
+    if name == 'fixture':
+        return FixtureProvider(FIXTURE_DIR, upstream=YFinanceProvider() if FIXTURE_RECORD else None)
+    if name == 'synthetic':
+        return SyntheticProvider()
+    raise ValueError(f"Unknown market data provider: {name}")
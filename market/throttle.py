@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+PROVIDER_CONCURRENCY = int(os.environ.get('STICKYNOTE_PROVIDER_CONCURRENCY', 8))
+PROVIDER_RATE = float(os.environ.get('STICKYNOTE_PROVIDER_RATE', 5))
+PROVIDER_BURST = int(os.environ.get('STICKYNOTE_PROVIDER_BURST', 10))
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for and share its result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key, fn, *args):
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self.executions += 1
+            else:
+                self.shared += 1
+        if not leader:
+            return future.result()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return future.result()
+
+
+class TokenBucket:
+    """Blocking token bucket: ``rate`` tokens per second, up to ``capacity`` banked."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ProviderGate:
+    """Single-flight, a concurrency cap and a rate limit in front of a remote provider."""
+
+    def __init__(self, concurrency=PROVIDER_CONCURRENCY, rate=PROVIDER_RATE, burst=PROVIDER_BURST):
+        self.flights = SingleFlight()
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.bucket = TokenBucket(rate, burst)
+
+    def _call(self, fn, *args):
+        with self.slots:
+            self.bucket.acquire()
+            return fn(*args)
+
+    def call(self, key, fn, *args):
+        """Run ``fn(*args)`` once for all concurrent callers with the same ``key``."""
+        return self.flights.do(key, self._call, fn, *args)
+
+
+provider_gate = ProviderGate()
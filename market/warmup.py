@@ -0,0 +1,186 @@
+"""Bulk warm-up of the market-data caches for every ticker in sp500_companies.json.
+
+    python -m market.warmup                 # refresh everything once
+    python -m market.warmup --schedule      # refresh every day after the close
+    python -m market.warmup AAPL MSFT       # refresh a few tickers
+
+Daily bars come from the provider's multi-ticker download, one request per
+batch, and go into the on-disk history store. Info and quotes are fetched per
+ticker on a bounded thread pool and written through the shared caches, then
+the columnar fundamentals table is rebuilt from them.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from companies.catalog import get_catalog
+from market.cache import info_cache, quote_cache
+from market.fundamentals import build_fundamentals
+from market.history import history_store
+from market.provider import get_provider
+from market.throttle import provider_gate
+
+BATCH_SIZE = 50
+WORKERS = 8
+HISTORY_YEARS = 5
+RETRIES = 3
+# Refresh after the US close, once the day's bars are final.
+SCHEDULE_AT = os.environ.get('STICKYNOTE_WARMUP_AT', '16:30')
+SCHEDULE_TZ = ZoneInfo('America/New_York')
+
+
+def load_tickers():
+    return list(get_catalog().names)
+
+
+def with_retry(fn, *args, retries=RETRIES, base_delay=1.0):
+    """Call ``fn`` with exponential backoff and jitter between failed attempts."""
+    for attempt in range(retries + 1):
+        try:
+            return fn(*args)
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(base_delay * 2 ** attempt * (0.5 + random.random()))
+
+
+def _download_batch(tickers, start, end):
+    tickers = tuple(tickers)
+    frames = provider_gate.call(('download', tickers, start, end), get_provider().history_batch, tickers, start, end)
+    if not frames:
+        raise RuntimeError(f"Empty download for {', '.join(tickers)}")
+    return frames
+
+
+def _fetch_info(ticker):
+    provider = get_provider()
+    info = provider_gate.call(('info', ticker), provider.info, ticker)
+    if not info or len(info) <= 1:
+        raise RuntimeError(f"Empty info for {ticker}")
+    return info, provider_gate.call(('quote', ticker), provider.quote, ticker)
+
+
+class WarmupReport:
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.failures = {}  # (ticker, kind) -> error message
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, ticker, kind, error=None):
+        with self._lock:
+            if error is not None:
+                self.failures[(ticker, kind)] = str(error)
+            if kind == 'info':
+                self.done += 1
+
+    def summary(self):
+        elapsed = time.time() - self.started_at
+        return f"Processed {self.done}/{self.total} tickers in {elapsed:.1f}s, {len(self.failures)} failure(s)"
+
+
+def warm_up(tickers=None, batch_size=BATCH_SIZE, workers=WORKERS, years=HISTORY_YEARS, progress=print):
+    """Fetch bars and info for ``tickers`` (default: all S&P 500) into the caches."""
+    tickers = [t.upper() for t in (tickers or load_tickers())]
+    report = WarmupReport(len(tickers))
+    end = date.today() + timedelta(days=1)
+    start = end - timedelta(days=365 * years)
+
+    for i in range(0, len(tickers), batch_size):
+        batch = tickers[i:i + batch_size]
+        try:
+            frames = with_retry(_download_batch, batch, start, end)
+        except Exception as e:
+            frames = {}
+            progress(f"History batch {i // batch_size + 1} failed: {e}")
+        for ticker in batch:
+            if ticker in frames and len(frames[ticker]):
+                history_store.ingest(ticker, frames[ticker], start, end)
+                report.record(ticker, 'history')
+            else:
+                report.record(ticker, 'history', 'no bars returned')
+        progress(f"History: {min(i + batch_size, len(tickers))}/{len(tickers)} tickers")
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='warmup') as pool:
+        futures = {pool.submit(with_retry, _fetch_info, ticker): ticker for ticker in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                info, quote = future.result()
+                info_cache.put(ticker, info)
+                quote_cache.put(ticker, quote)
+                report.record(ticker, 'info')
+            except Exception as e:
+                report.record(ticker, 'info', e)
+            if report.done % 50 == 0 or report.done == report.total:
+                progress(f"Info: {report.done}/{report.total} tickers")
+
+    try:
+        build_fundamentals()
+        progress("Fundamentals table rebuilt")
+    except Exception as e:
+        progress(f"Fundamentals table rebuild failed: {e}")
+
+    for (ticker, kind), error in sorted(report.failures.items()):
+        progress(f"  {ticker} {kind}: {error}")
+    progress(report.summary())
+    return report
+
+
+def seconds_until(at=SCHEDULE_AT, now=None):
+    """Seconds from ``now`` until the next ``HH:MM`` in New York time."""
+    now = now or datetime.now(SCHEDULE_TZ)
+    hour, minute = map(int, at.split(':'))
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+def _run_schedule(stop, at, **kwargs):
+    while not stop.wait(seconds_until(at)):
+        try:
+            warm_up(**kwargs)
+        except Exception as e:
+            print(f"Warm-up failed: {e}")
+
+
+def start_background_refresher(at=SCHEDULE_AT, **kwargs):
+    """Run ``warm_up`` daily at ``at`` (New York time) in a daemon thread.
+
+    Returns a ``threading.Event``; set it to stop the refresher.
+    """
+    stop = threading.Event()
+    threading.Thread(
+        target=_run_schedule, args=(stop, at), kwargs=kwargs, name='market-warmup', daemon=True
+    ).start()
+    return stop
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm the market-data caches.")
+    parser.add_argument('tickers', nargs='*', help="Tickers to refresh (default: all of sp500_companies.json)")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--years', type=int, default=HISTORY_YEARS)
+    parser.add_argument('--schedule', action='store_true', help=f"Keep running and refresh daily at {SCHEDULE_AT} ET")
+    args = parser.parse_args(argv)
+    kwargs = dict(tickers=args.tickers or None, batch_size=args.batch_size, workers=args.workers, years=args.years)
+    report = warm_up(**kwargs)
+    if args.schedule:
+        try:
+            _run_schedule(threading.Event(), SCHEDULE_AT, **kwargs)
+        except KeyboardInterrupt:
+            pass
+    return 1 if report.failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
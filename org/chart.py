@@ -0,0 +1,316 @@
+import os
+from collections import deque
+
+import numpy as np
+import plotly.graph_objects as go
+
+from utils import LRUCache
+
+CHART_CACHE_SIZE = 256
+# Whole-company charts are large, so only a few expansions are kept
+COMPANY_CHART_CACHE_SIZE = 8
+Y_GAP = 1.5
+X_GAP = 2
+MAX_PER_ROW = 8
+# Whole-company charts: executives drawn before subtrees are folded into "+N" nodes
+NODE_BUDGET = int(os.environ.get('STICKYNOTE_ORG_NODE_BUDGET', 1500))
+LABEL_LIMIT = 300
+
+
+def create_org_chart(directory, selected_exec):
+    """Create an interactive org chart showing manager and direct reports for selected executive, with improved layout and styling, and a badge for role_tag."""
+    executives = directory.executives
+    i = directory.ids[selected_exec]
+    manager = directory.parent[i]
+    reports = directory.children[i]
+
+    # Manager (if any) at top center, selected exec in the middle,
+    # direct reports (first name only) centered below, 8 per row.
+    nodes = ([manager] if manager != -1 else []) + [i] + reports
+    top = len(nodes) - len(reports)  # manager and selected exec
+    node_x = [0.0] * top
+    node_y = [Y_GAP, 0.0][-top:]
+    for k in range(len(reports)):
+        row, col = divmod(k, MAX_PER_ROW)
+        in_row = min(MAX_PER_ROW, len(reports) - row * MAX_PER_ROW)
+        node_x.append((col - (in_row - 1) / 2) * X_GAP if in_row > 1 else 0)
+        node_y.append(-Y_GAP * (row + 1))
+
+    names = [directory.names[n] for n in nodes]
+    node_text = names[:top] + [name.split()[0] for name in names[top:]]
+    node_hover = [f"{name}<br>{executives[name].get('title', '')}" for name in names]
+    node_colors = ['rgb(31, 119, 180)' if n == i else 'rgb(158, 202, 225)' for n in nodes]
+    node_tags = [executives[name].get('role_tag', 'E') for name in names]
+
+    # Each node after the first hangs off the selected exec, except the exec itself off its manager
+    edge_x, edge_y = [], []
+    for child in range(1, len(nodes)):
+        parent = 0 if child < top else top - 1
+        edge_x.extend([node_x[parent], node_x[child], None])
+        edge_y.extend([node_y[parent], node_y[child], None])
+
+    edge_trace = go.Scatter(
+        x=edge_x, y=edge_y,
+        line=dict(width=1, color='#888'),
+        hoverinfo='none',
+        mode='lines'
+    )
+    node_trace = go.Scatter(
+        x=node_x, y=node_y,
+        mode='markers+text',
+        hoverinfo='text',
+        text=node_text,
+        textposition="bottom center",
+        marker=dict(
+            showscale=False,
+            color=node_colors,
+            size=40,
+            line_width=2,
+            line_color='white',
+            symbol='square'  # Use squares for nodes
+        ),
+        customdata=names,
+        textfont=dict(color='black', size=14),  # Make all text black
+        hovertext=node_hover,
+        hoverlabel=dict(font=dict(color='black'))
+    )
+    # Badge trace for role_tag (E, C, M), centred on each square
+    badge_trace = go.Scatter(
+        x=node_x,
+        y=node_y,
+        mode='text',
+        text=node_tags,
+        textposition='middle center',
+        textfont=dict(color='black', size=16, family='Arial Black'),
+        marker=dict(color='white', size=24, line=dict(width=1, color='black')),
+        showlegend=False,
+        hoverinfo='none'
+    )
+
+    return go.Figure(data=[edge_trace, node_trace, badge_trace],
+                     layout=go.Layout(
+                         showlegend=False,
+                         hovermode='closest',
+                         margin=dict(b=40, l=40, r=40, t=80),
+                         xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                         yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                         height=400,
+                         plot_bgcolor='white',
+                         clickmode='event+select',
+                         hoverlabel=dict(bgcolor="white", font_size=16, font_family="Rockwell", font_color='black')
+                     ))
+
+
+def collapse_tree(index, expanded=(), budget=None):
+    """Choose the nodes of a whole-company chart.
+
+    Walks the hierarchy breadth-first, showing an executive's reports while
+    the number of drawn points stays within ``budget``. Past that point each
+    executive's reports are replaced by one aggregate node. Executives whose
+    ids are in ``expanded`` always show their reports. Returns ``(exec_id,
+    parent, hidden)`` tuples, one per drawn node, parents first. ``parent``
+    indexes the same list, and ``hidden`` is 0 for an executive or the number
+    of executives folded into an aggregate node.
+    """
+    budget = NODE_BUDGET if budget is None else budget
+    tree_children = index.tree_children
+    nodes = [(root, -1, 0) for root in index.roots]
+    # Every drawn executive with reports reserves a point for its "+N" node,
+    # which is released when its reports are shown instead.
+    shown = len(nodes) + sum(1 for root in index.roots if tree_children[root])
+    queue = deque(range(len(nodes)))
+    while queue:
+        k = queue.popleft()
+        i = nodes[k][0]
+        children = tree_children[i]
+        if not children:
+            continue
+        cost = len(children) + sum(1 for child in children if tree_children[child]) - 1
+        if i in expanded or shown + cost <= budget:
+            for child in children:
+                queue.append(len(nodes))
+                nodes.append((child, k, 0))
+            shown += cost
+        else:
+            nodes.append((i, k, index.subtree_size[i] - 1))
+    return nodes
+
+
+def tidy_layout(nodes):
+    """O(n) layered tree layout: leaves left to right in walk order, parents centred over their children."""
+    children = [[] for _ in nodes]
+    for k, (_, parent, _) in enumerate(nodes):
+        if parent != -1:
+            children[parent].append(k)
+    x = [0.0] * len(nodes)
+    y = [0.0] * len(nodes)
+    next_x = 0
+    stack = [k for k, node in enumerate(nodes) if node[1] == -1][::-1]
+    while stack:
+        k = stack.pop()
+        if nodes[k][1] != -1:
+            y[k] = y[nodes[k][1]] - 1
+        if children[k]:
+            stack.extend(reversed(children[k]))
+        else:
+            x[k] = next_x
+            next_x += 1
+    # Nodes are listed parents first, so walking backwards sees every child before its parent.
+    for k in range(len(nodes) - 1, -1, -1):
+        if children[k]:
+            x[k] = (x[children[k][0]] + x[children[k][-1]]) / 2
+    return x, y
+
+
+def _company_base(directory, expanded, budget):
+    """The whole-company chart without a selection, as a figure dict, plus each drawn executive's (x, y).
+
+    ``expanded`` holds executive ids. Each point's ``customdata`` is
+    ``['exec', name]``, or ``['expand', name]`` for the "+N" node holding
+    ``name``'s reports.
+    """
+    nodes = collapse_tree(directory.hierarchy, expanded, budget)
+    x, y = tidy_layout(nodes)
+
+    edge_x, edge_y = [], []
+    for k, (_, parent, _) in enumerate(nodes):
+        if parent != -1:
+            edge_x.extend([x[parent], x[k], None])
+            edge_y.extend([y[parent], y[k], None])
+
+    executives = directory.executives
+    names = [directory.names[i] for i, _, _ in nodes]
+    labels, hover, colors, sizes, customdata = [], [], [], [], []
+    positions = {}
+    for k, ((i, _, hidden), name) in enumerate(zip(nodes, names)):
+        if hidden:
+            labels.append(f"+{hidden}")
+            hover.append(f"{hidden} more under {name}<br>Click to expand")
+            colors.append('rgb(200, 200, 200)')
+            sizes.append(16)
+            customdata.append(['expand', name])
+        else:
+            labels.append(name.split()[0])
+            hover.append(f"{name}<br>{executives[name].get('title', '')}")
+            colors.append('rgb(158, 202, 225)')
+            sizes.append(14)
+            customdata.append(['exec', name])
+            positions[i] = (x[k], y[k])
+    show_labels = len(nodes) <= LABEL_LIMIT
+
+    # numpy arrays skip plotly's per-element validation, which dominates build time for big orgs.
+    x, y = np.array(x), np.array(y)
+    edge_trace = go.Scattergl(
+        x=np.array(edge_x, dtype=float), y=np.array(edge_y, dtype=float),
+        line=dict(width=1, color='#888'),
+        hoverinfo='none',
+        mode='lines'
+    )
+    node_trace = go.Scattergl(
+        x=x, y=y,
+        mode='markers+text' if show_labels else 'markers',
+        text=labels if show_labels else None,
+        textposition="bottom center",
+        textfont=dict(color='black', size=11),
+        hoverinfo='text',
+        hovertext=hover,
+        marker=dict(color=colors, size=np.array(sizes), symbol='square', line=dict(width=1, color='white')),
+        customdata=np.array(customdata, dtype=object),
+    )
+    levels = 1 - (y.min() if len(y) else 0)
+    figure = go.Figure(data=[edge_trace, node_trace],
+                       layout=go.Layout(
+                           showlegend=False,
+                           hovermode='closest',
+                           margin=dict(b=20, l=20, r=20, t=20),
+                           xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                           yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                           height=max(400, 90 * levels),
+                           plot_bgcolor='white',
+                           clickmode='event+select',
+                           dragmode='pan',
+                           hoverlabel=dict(bgcolor="white", font_size=14, font_color='black')
+                       ))
+    return figure.to_dict(), positions
+
+
+def _expanded_ids(directory, expanded):
+    return frozenset(directory.ids[name] for name in expanded if name in directory)
+
+
+def _with_ancestors(directory, expanded, selected):
+    """``expanded`` plus every manager above ``selected``, so the selected executive is drawn."""
+    tree_parent = directory.hierarchy.tree_parent
+    expanded = set(expanded)
+    manager = tree_parent[selected]
+    while manager != -1:
+        expanded.add(manager)
+        manager = tree_parent[manager]
+    return frozenset(expanded)
+
+
+def _highlight(directory, base, positions, selected_exec):
+    """A figure drawing ``base`` with ``selected_exec`` marked by one extra point on top."""
+    data = list(base['data'])
+    selected = directory.ids.get(selected_exec, -1)
+    if selected in positions:
+        x, y = positions[selected]
+        title = directory.executives[selected_exec].get('title', '')
+        data.append(dict(
+            type='scattergl', x=[x], y=[y], mode='markers',
+            hoverinfo='text', hovertext=[f"{selected_exec}<br>{title}"],
+            marker=dict(color='rgb(31, 119, 180)', size=24, symbol='square', line=dict(width=1, color='white')),
+            customdata=[['exec', selected_exec]],
+        ))
+    # The base was validated when it was built; revalidating it costs more than building the highlight.
+    return go.Figure(dict(base, data=data), _validate=False)
+
+
+def create_company_chart(directory, selected_exec=None, expanded=(), budget=None):
+    """Whole-company org chart using WebGL traces, with large subtrees folded into "+N" nodes.
+
+    Executives named in ``expanded``, and the managers above ``selected_exec``,
+    always show their reports. Each point's ``customdata`` is
+    ``['exec', name]``, or ``['expand', name]`` for the "+N" node holding
+    ``name``'s reports.
+    """
+    expanded = _expanded_ids(directory, expanded)
+    selected = directory.ids.get(selected_exec, -1)
+    if selected != -1:
+        expanded = _with_ancestors(directory, expanded, selected)
+    base, positions = _company_base(directory, expanded, budget)
+    return _highlight(directory, base, positions, selected_exec)
+
+
+_cache = LRUCache(CHART_CACHE_SIZE)  # (kind, ticker, version, ...) -> go.Figure
+_company_cache = LRUCache(COMPANY_CHART_CACHE_SIZE)  # (ticker, version, expanded ids, budget) -> (figure dict, positions)
+
+
+def get_org_chart(directory, selected_exec):
+    """Return the org chart for ``selected_exec``, built once per (ticker, exec, data version).
+
+    Figures are shared between sessions and reruns; callers must not modify them.
+    """
+    key = ('team', directory.ticker, directory.version, selected_exec)
+    return _cache.get_or_build(key, create_org_chart, directory, selected_exec)
+
+
+def _get_company_base(directory, expanded, budget):
+    key = (directory.ticker, directory.version, expanded, budget)
+    return _company_cache.get_or_build(key, _company_base, directory, expanded, budget)
+
+
+def get_company_chart(directory, selected_exec=None, expanded=(), budget=None):
+    """Memoized ``create_company_chart``.
+
+    The chart is built once per expansion and shared between sessions; only
+    the selected executive's highlight is added per call. Clicking an
+    executive already on screen therefore reuses the cached chart.
+    """
+    expanded = _expanded_ids(directory, expanded)
+    base, positions = _get_company_base(directory, expanded, budget)
+    selected = directory.ids.get(selected_exec, -1)
+    if selected != -1 and selected not in positions:
+        # Folded away: expand the managers above it, as create_company_chart does.
+        base, positions = _get_company_base(directory, _with_ancestors(directory, expanded, selected), budget)
+    return _highlight(directory, base, positions, selected_exec)
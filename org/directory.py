@@ -0,0 +1,86 @@
+import json
+import os
+from functools import cached_property
+
+from org.snapshot import get_snapshot
+from settings import DATA_DIR
+from utils import LRUCache
+
+DIRECTORY_CACHE_SIZE = 64
+
+
+class ExecutiveDirectory:
+    """One company's executives, parsed once with the lookups the pages need.
+
+    ``executives`` is the raw ``<ticker>_executives.json`` dict. Executives are
+    also numbered in file order: ``names[i]`` / ``ids[name]`` map between the
+    two, ``parent[i]`` is the manager id (-1 for none or unknown),
+    ``children[i]`` the ids of known direct reports; levels and subtree
+    statistics live in ``hierarchy``. ``version`` identifies the file
+    contents the directory was built from.
+    """
+
+    def __init__(self, ticker, executives, version=None):
+        self.ticker = ticker.upper()
+        self.executives = executives
+        self.version = version
+        self.names = list(executives)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.labels = {name: f"{name} - {info.get('title', '')}" for name, info in executives.items()}
+        self.parent = [self.ids.get(info.get('reports_to'), -1) for info in executives.values()]
+        self.children = [
+            [self.ids[r] for r in info.get('direct_reports', []) if r in self.ids]
+            for info in executives.values()
+        ]
+
+    @cached_property
+    def hierarchy(self):
+        """Subtree statistics, built on first use; see ``org.hierarchy.HierarchyIndex``."""
+        from org.hierarchy import HierarchyIndex
+        return HierarchyIndex(self)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def __getitem__(self, name):
+        return self.executives[name]
+
+
+def executives_path(ticker, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f'{ticker.lower()}_executives.json')
+
+
+_cache = LRUCache(DIRECTORY_CACHE_SIZE)  # path -> ExecutiveDirectory
+
+
+def get_directory(ticker, data_dir=DATA_DIR):
+    """Return the cached ExecutiveDirectory for ``ticker``, or None if there is no data.
+
+    Directories are kept in a bounded process-wide LRU and rebuilt only when
+    the file's mtime or size changes. Companies are read from the executive
+    snapshot (see ``org.snapshot``) while it is current for the file, and
+    from the JSON otherwise.
+    """
+    path = executives_path(ticker, data_dir)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    version = (st.st_mtime_ns, st.st_size)
+    directory = _cache.get(path)
+    if directory is not None and directory.version == version:
+        return directory
+    snapshot = get_snapshot()
+    if snapshot is not None and snapshot.version(ticker) == version:
+        directory = ExecutiveDirectory(ticker, snapshot.executives(ticker), version)
+    else:
+        try:
+            with open(path, 'r') as f:
+                directory = ExecutiveDirectory(ticker, json.load(f), version)
+        except (OSError, ValueError):
+            return None
+    _cache.put(path, directory)
+    return directory
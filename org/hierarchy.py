@@ -0,0 +1,160 @@
+"""Reporting-hierarchy statistics for one company.
+
+    python -m org.hierarchy DIS     # summary plus any data problems
+"""
+import argparse
+import sys
+
+
+class HierarchyIndex:
+    """Subtree statistics over an ExecutiveDirectory, computed once and iteratively.
+
+    The org tree follows ``direct_reports``, visiting executives in file order
+    from the top-level ones (those nobody lists as a report). Each executive
+    gets:
+
+    * ``total_reports``: all reports at every level. Names listed in
+      ``direct_reports`` without an entry of their own count as one report each;
+      the report that closes a cycle is not counted.
+    * ``subtree_size``: known executives in the org, including the executive.
+    * ``depth``: levels below the top of the tree.
+    * ``max_span``: largest ``direct_reports`` list anywhere in the org.
+    * ``tin`` / ``tout``: Euler-tour entry and exit times, so ``in_org`` is O(1).
+
+    ``tree_parent`` / ``tree_children`` hold the tree itself (ids as in the
+    directory) and ``roots`` the executives each walk started from.
+
+    No recursion is used, so deep hierarchies are fine. A reporting cycle is
+    broken where the walk first meets it and recorded in ``cycles``. An
+    executive listed under several managers keeps the first one and is
+    recorded in ``multiple_managers``. Report and manager names with no
+    entry of their own end up in ``dangling_reports`` / ``dangling_managers``.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        names = directory.names
+        n = len(names)
+        self.tin = [-1] * n
+        self.tout = [-1] * n
+        self.depth = [0] * n
+        self.tree_parent = [-1] * n
+        self.tree_children = [[] for _ in range(n)]
+        self.roots = []
+        self.cycles = []
+        self.multiple_managers = {}
+        self.dangling_reports = []
+        self.dangling_managers = []
+
+        raw_reports = [directory.executives[name].get('direct_reports', []) for name in names]
+        for name, reports in zip(names, raw_reports):
+            self.dangling_reports.extend((name, r) for r in reports if r not in directory)
+        for name in names:
+            manager = directory.executives[name].get('reports_to')
+            if manager and manager not in directory:
+                self.dangling_managers.append((name, manager))
+
+        listed = [False] * n
+        for children in directory.children:
+            for child in children:
+                listed[child] = True
+        # Top-level executives first, then anything only reachable through a cycle.
+        starts = [i for i in range(n) if not listed[i]] + list(range(n))
+
+        self.span = [len(reports) for reports in raw_reports]
+        self.total_reports = list(self.span)
+        clock = 0
+        order = []  # post-order
+        for root in starts:
+            if self.tin[root] != -1:
+                continue
+            self.roots.append(root)
+            self.tin[root] = clock
+            clock += 1
+            stack = [(root, 0)]
+            while stack:
+                node, i = stack[-1]
+                children = directory.children[node]
+                if i < len(children):
+                    stack[-1] = (node, i + 1)
+                    child = children[i]
+                    if self.tin[child] == -1:
+                        self.tin[child] = clock
+                        clock += 1
+                        self.tree_parent[child] = node
+                        self.tree_children[node].append(child)
+                        self.depth[child] = self.depth[node] + 1
+                        stack.append((child, 0))
+                    elif self.tout[child] == -1:
+                        # ``child`` is ``node`` or one of its managers; counting it would
+                        # make every executive on the cycle its own report.
+                        self.total_reports[node] -= 1
+                        self.cycles.append(self._cycle_path(child, node))
+                    else:
+                        managers = self.multiple_managers.setdefault(names[child], [names[self.tree_parent[child]]])
+                        managers.append(names[node])
+                else:
+                    stack.pop()
+                    self.tout[node] = clock
+                    order.append(node)
+
+        self.subtree_size = [1] * n
+        self.max_span = list(self.span)
+        for node in order:
+            parent = self.tree_parent[node]
+            if parent != -1:
+                self.subtree_size[parent] += self.subtree_size[node]
+                self.total_reports[parent] += self.total_reports[node]
+                self.max_span[parent] = max(self.max_span[parent], self.max_span[node])
+
+    def _cycle_path(self, top, bottom):
+        """Names from ``top`` down the current walk to ``bottom``, which reports back to ``top``."""
+        path = [bottom]
+        while path[-1] != top:
+            path.append(self.tree_parent[path[-1]])
+        return [self.directory.names[i] for i in reversed(path)]
+
+    def stats(self, name):
+        i = self.directory.ids[name]
+        return {
+            'direct_reports': self.span[i],
+            'total_reports': self.total_reports[i],
+            'subtree_size': self.subtree_size[i],
+            'depth': self.depth[i],
+            'max_span': self.max_span[i],
+        }
+
+    def in_org(self, name, manager):
+        """True if ``name`` is ``manager`` or anywhere below them in the tree."""
+        a, b = self.directory.ids[name], self.directory.ids[manager]
+        return self.tin[b] <= self.tin[a] < self.tout[b]
+
+    def issues(self):
+        """Human-readable descriptions of data problems found while indexing."""
+        messages = [f"Reporting cycle: {' -> '.join(cycle + cycle[:1])}" for cycle in self.cycles]
+        messages += [f"{name} is listed under several managers: {', '.join(m)}"
+                     for name, m in self.multiple_managers.items()]
+        messages += [f"{manager} lists unknown direct report {report!r}" for manager, report in self.dangling_reports]
+        messages += [f"{name} reports to unknown manager {manager!r}" for name, manager in self.dangling_managers]
+        return messages
+
+
+def main(argv=None):
+    from org.directory import get_directory
+    parser = argparse.ArgumentParser(description="Check a company's reporting hierarchy.")
+    parser.add_argument('ticker')
+    args = parser.parse_args(argv)
+    directory = get_directory(args.ticker)
+    if directory is None:
+        print(f"No executive data for {args.ticker}")
+        return 1
+    index = directory.hierarchy
+    print(f"{len(directory)} executives, max depth {max(index.depth, default=0)}, "
+          f"max span {max(index.max_span, default=0)}")
+    for message in index.issues():
+        print(f"  {message}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
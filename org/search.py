@@ -0,0 +1,194 @@
+"""Full-text search over every ``data/*_executives.json`` file.
+
+    python -m org.search "chief financial"     # rebuild what changed, then query
+"""
+import argparse
+import glob
+import heapq
+import json
+import math
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import namedtuple
+from functools import lru_cache
+
+from companies.catalog import tokenize
+from settings import CACHE_DIR, DATA_DIR
+
+INDEX_PATH = os.path.join(CACHE_DIR, 'exec_search.json')
+INDEX_FORMAT = 1
+REFRESH_SECONDS = 10
+SEARCH_LIMIT = 20
+# Per-field weight of a matching word; a word found in several fields adds them up.
+FIELD_WEIGHTS = {'name': 5.0, 'title': 3.0, 'role_tag': 2.0, 'history': 1.5, 'bio': 1.0}
+
+ExecutiveHit = namedtuple('ExecutiveHit', ['ticker', 'name', 'title', 'score'])
+
+
+def _ticker_from_path(path):
+    return os.path.basename(path)[:-len('_executives.json')].upper()
+
+
+def index_executives(executives):
+    """Index one company's executives: ``(docs, postings)``.
+
+    ``docs`` is a list of ``[name, title]`` and ``postings`` maps each word to
+    ``[[doc, weight], ...]``.
+    """
+    docs, postings = [], {}
+    for doc, (name, info) in enumerate(executives.items()):
+        docs.append([name, info.get('title', '')])
+        fields = {
+            'name': name,
+            'title': info.get('title', ''),
+            'role_tag': info.get('role_tag', ''),
+            'bio': info.get('bio', ''),
+            'history': ' '.join(f"{h.get('title', '')} {h.get('company', '')}" for h in info.get('history', [])),
+        }
+        weights = {}
+        for field, text in fields.items():
+            for token in set(tokenize(text or '')):
+                weights[token] = weights.get(token, 0) + FIELD_WEIGHTS[field]
+        for token, weight in weights.items():
+            postings.setdefault(token, []).append([doc, weight])
+    return docs, postings
+
+
+class ExecutiveSearch:
+    """Inverted index over all executive files, persisted to ``index_path``.
+
+    ``refresh`` re-indexes only files whose mtime or size changed and drops
+    deleted ones, then merges the per-file postings for querying. Queries
+    match every word, the last one as a prefix so results update while
+    typing, and rank by field weight times inverse document frequency.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, index_path=INDEX_PATH):
+        self.data_dir = data_dir
+        self.index_path = index_path
+        self._files = None  # ticker -> {'version', 'docs', 'postings'}
+        self._postings = {}  # word -> [(ticker, doc, weight)]
+        self._words = []
+        self._n_docs = 0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return index.get('files', {}) if index.get('format') == INDEX_FORMAT else {}
+
+    def _save_index(self):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = f'{self.index_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'format': INDEX_FORMAT, 'files': self._files}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self, force=False):
+        """Bring the index up to date with the data directory; returns the re-indexed tickers."""
+        with self._lock:
+            if not force and time.monotonic() - self._checked_at < REFRESH_SECONDS:
+                return []
+            self._checked_at = time.monotonic()
+            loaded = self._files is None
+            if loaded:
+                self._files = self._load_index()
+            versions = {}
+            for path in glob.glob(os.path.join(self.data_dir, '*_executives.json')):
+                st = os.stat(path)
+                versions[_ticker_from_path(path)] = (path, [st.st_mtime_ns, st.st_size])
+            changed = [t for t, (_, v) in versions.items() if self._files.get(t, {}).get('version') != v]
+            removed = [t for t in self._files if t not in versions]
+            for ticker in removed:
+                del self._files[ticker]
+            for ticker in changed:
+                path, version = versions[ticker]
+                try:
+                    with open(path, 'r') as f:
+                        docs, postings = index_executives(json.load(f))
+                except (OSError, ValueError):
+                    self._files.pop(ticker, None)
+                    continue
+                self._files[ticker] = {'version': version, 'docs': docs, 'postings': postings}
+            if changed or removed:
+                self._save_index()
+            if changed or removed or loaded:
+                self._merge()
+            return changed
+
+    def _merge(self):
+        postings = {}
+        for ticker, entry in self._files.items():
+            for word, hits in entry['postings'].items():
+                postings.setdefault(word, []).extend((ticker, doc, weight) for doc, weight in hits)
+        self._postings = postings
+        self._words = sorted(postings)
+        self._n_docs = sum(len(entry['docs']) for entry in self._files.values())
+
+    def _matches(self, word, prefix):
+        """``{(ticker, doc): score}`` for one query word."""
+        if prefix:
+            i = bisect_left(self._words, word)
+            words = []
+            while i < len(self._words) and self._words[i].startswith(word):
+                words.append(self._words[i])
+                i += 1
+        else:
+            words = [word] if word in self._postings else []
+        scores = {}
+        for w in words:
+            hits = self._postings[w]
+            idf = math.log(1 + self._n_docs / len(hits))
+            for ticker, doc, weight in hits:
+                key = (ticker, doc)
+                scores[key] = max(scores.get(key, 0), weight * idf)
+        return scores
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Best-matching executives across all companies, as ``ExecutiveHit``."""
+        self.refresh()
+        words = tokenize(query)
+        if not words:
+            return []
+        with self._lock:
+            scores = None
+            for i, word in enumerate(words):
+                word_scores = self._matches(word, prefix=i == len(words) - 1)
+                if scores is None:
+                    scores = word_scores
+                else:
+                    scores = {k: s + word_scores[k] for k, s in scores.items() if k in word_scores}
+                if not scores:
+                    return []
+            ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [ExecutiveHit(ticker, *self._files[ticker]['docs'][doc], score)
+                    for (ticker, doc), score in ranked]
+
+
+@lru_cache(maxsize=None)
+def get_executive_search(data_dir=DATA_DIR, index_path=INDEX_PATH):
+    """Process-wide ExecutiveSearch over ``data_dir``."""
+    return ExecutiveSearch(data_dir, index_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search executives across all companies.")
+    parser.add_argument('query', nargs='*')
+    args = parser.parse_args(argv)
+    search = get_executive_search()
+    changed = search.refresh(force=True)
+    print(f"Re-indexed {len(changed)} file(s)")
+    for hit in search.search(' '.join(args.query)):
+        print(f"{hit.score:7.2f}  {hit.ticker:6} {hit.name} - {hit.title}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
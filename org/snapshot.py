@@ -0,0 +1,234 @@
+"""Compact, memory-mapped snapshot of every ``data/*_executives.json`` file.
+
+    python -m org.snapshot          # (re)build CACHE_DIR/executives.snap
+
+The JSON files stay the source of truth. The snapshot records each file's
+mtime and size, and ``org.directory`` only reads a company from it while
+those still match. Layout after a small header:
+
+* ``string_offsets`` / ``strings``: every distinct name, title and role tag, stored once.
+* ``tickers``: per company, its string id, its slice of ``execs`` and the source file version.
+* ``execs``: one fixed-width row per executive with the fields the org chart needs.
+* ``reports``: string ids of each executive's ``direct_reports``.
+* ``extras``: the remaining fields (bio, history, salary, ...) as JSON, decoded on first access.
+"""
+import argparse
+import glob
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping
+from functools import lru_cache
+
+import numpy as np
+
+from settings import CACHE_DIR, DATA_DIR
+
+SNAPSHOT_PATH = os.path.join(CACHE_DIR, 'executives.snap')
+MAGIC = b'STKYEXS1'
+HEADER = struct.Struct('<8sI')  # magic, length of the JSON section table that follows
+ABSENT = -1  # key not present
+NULL = -2  # key present with a null value
+STRUCTURED = ('title', 'role_tag', 'reports_to', 'direct_reports')
+
+TICKER_DTYPE = np.dtype([('ticker', '<u4'), ('first', '<u4'), ('count', '<u4'), ('mtime_ns', '<i8'), ('size', '<i8')])
+EXEC_DTYPE = np.dtype([
+    ('name', '<u4'), ('title', '<i4'), ('role_tag', '<i4'), ('reports_to', '<i4'),
+    ('reports_first', '<i8'), ('reports_count', '<u4'), ('extras_offset', '<u8'), ('extras_length', '<u4'),
+])
+
+
+class _Interner:
+    def __init__(self):
+        self.ids = {}
+        self.encoded = []
+
+    def __call__(self, value):
+        if value is None:
+            return NULL
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.encoded)
+            self.encoded.append(value.encode('utf-8'))
+        return sid
+
+
+def build_snapshot(data_dir=DATA_DIR, path=SNAPSHOT_PATH):
+    """Compile every executives file in ``data_dir`` into one snapshot at ``path``; returns the ticker count."""
+    intern = _Interner()
+    tickers, execs, reports, extras = [], [], [], bytearray()
+    for source in sorted(glob.glob(os.path.join(data_dir, '*_executives.json'))):
+        st = os.stat(source)
+        with open(source, 'r') as f:
+            executives = json.load(f)
+        ticker = os.path.basename(source)[:-len('_executives.json')].upper()
+        tickers.append((intern(ticker), len(execs), len(executives), st.st_mtime_ns, st.st_size))
+        for name, info in executives.items():
+            direct = info.get('direct_reports')
+            extra = json.dumps({k: v for k, v in info.items() if k not in STRUCTURED}, separators=(',', ':')).encode()
+            execs.append((
+                intern(name),
+                intern(info['title']) if 'title' in info else ABSENT,
+                intern(info['role_tag']) if 'role_tag' in info else ABSENT,
+                intern(info['reports_to']) if 'reports_to' in info else ABSENT,
+                len(reports) if direct is not None else ABSENT,
+                len(direct or ()),
+                len(extras), len(extra),
+            ))
+            reports.extend(intern(r) for r in direct or ())
+            extras += extra
+
+    string_offsets = np.zeros(len(intern.encoded) + 1, dtype='<u8')
+    np.cumsum([len(s) for s in intern.encoded], out=string_offsets[1:])
+    sections = {
+        'string_offsets': string_offsets.tobytes(),
+        'strings': b''.join(intern.encoded),
+        'tickers': np.array(tickers, dtype=TICKER_DTYPE).tobytes(),
+        'execs': np.array(execs, dtype=EXEC_DTYPE).tobytes(),
+        'reports': np.array(reports, dtype='<u4').tobytes(),
+        'extras': bytes(extras),
+    }
+    table, offset = {}, 0
+    for name, data in sections.items():
+        table[name] = [offset, len(data)]
+        offset += len(data) + (-len(data) % 8)
+    table_bytes = json.dumps(table).encode()
+    table_bytes += b' ' * (-(HEADER.size + len(table_bytes)) % 8)
+    base = HEADER.size + len(table_bytes)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(table_bytes)))
+        f.write(table_bytes)
+        for name, data in sections.items():
+            f.seek(base + table[name][0])
+            f.write(data)
+        f.write(b'\0' * (-f.tell() % 8))
+    os.replace(tmp_path, path)
+    return len(tickers)
+
+
+class SnapshotExecutive(Mapping):
+    """Read-only view of one executive; fields outside the fixed-width row are decoded on first access."""
+
+    __slots__ = ('_snapshot', '_row', '_structured', '_extras')
+
+    def __init__(self, snapshot, row):
+        self._snapshot = snapshot
+        self._row = row
+        self._structured = None
+        self._extras = None
+
+    def _fields(self):
+        if self._structured is None:
+            snapshot, row = self._snapshot, self._snapshot.execs[self._row]
+            fields = {}
+            for key in ('title', 'role_tag', 'reports_to'):
+                sid = int(row[key])
+                if sid != ABSENT:
+                    fields[key] = None if sid == NULL else snapshot.string(sid)
+            first = int(row['reports_first'])
+            if first != ABSENT:
+                reports = snapshot.reports[first:first + int(row['reports_count'])]
+                fields['direct_reports'] = [snapshot.string(int(sid)) for sid in reports]
+            self._structured = fields
+        return self._structured
+
+    def _extra(self):
+        if self._extras is None:
+            row = self._snapshot.execs[self._row]
+            start = self._snapshot.extras_offset + int(row['extras_offset'])
+            self._extras = json.loads(self._snapshot.buffer[start:start + int(row['extras_length'])])
+        return self._extras
+
+    def __getitem__(self, key):
+        if key in STRUCTURED:
+            return self._fields()[key]
+        return self._extra()[key]
+
+    def __iter__(self):
+        yield from self._fields()
+        yield from self._extra()
+
+    def __len__(self):
+        return len(self._fields()) + len(self._extra())
+
+
+class ExecutiveSnapshot:
+    """A memory-mapped snapshot file. Pages are shared by every process that maps it."""
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        with open(path, 'rb') as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, table_length = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an executive snapshot")
+        table = json.loads(self.buffer[HEADER.size:HEADER.size + table_length])
+        base = HEADER.size + table_length
+
+        def section(name, dtype):
+            offset, length = table[name]
+            return np.frombuffer(self.buffer, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=base + offset)
+
+        self.string_offsets = section('string_offsets', '<u8')
+        self.strings_offset = base + table['strings'][0]
+        self.tickers = section('tickers', TICKER_DTYPE)
+        self.execs = section('execs', EXEC_DTYPE)
+        self.reports = section('reports', '<u4')
+        self.extras_offset = base + table['extras'][0]
+        self._strings = {}
+        self._ticker_rows = {self.string(int(t)): i for i, t in enumerate(self.tickers['ticker'])}
+
+    def string(self, sid):
+        s = self._strings.get(sid)
+        if s is None:
+            start = self.strings_offset + int(self.string_offsets[sid])
+            end = self.strings_offset + int(self.string_offsets[sid + 1])
+            s = self._strings[sid] = self.buffer[start:end].decode('utf-8')
+        return s
+
+    def version(self, ticker):
+        """``(mtime_ns, size)`` of the JSON file ``ticker`` was built from, or None."""
+        i = self._ticker_rows.get(ticker.upper())
+        if i is None:
+            return None
+        row = self.tickers[i]
+        return int(row['mtime_ns']), int(row['size'])
+
+    def executives(self, ticker):
+        """``{name: SnapshotExecutive}`` in the source file's order."""
+        row = self.tickers[self._ticker_rows[ticker.upper()]]
+        first = int(row['first'])
+        return {self.string(int(sid)): SnapshotExecutive(self, first + k)
+                for k, sid in enumerate(self.execs['name'][first:first + int(row['count'])])}
+
+
+@lru_cache(maxsize=2)
+def _open(path, version):
+    return ExecutiveSnapshot(path)
+
+
+def get_snapshot(path=SNAPSHOT_PATH):
+    """The snapshot at ``path``, mapped once per file version; None if there isn't a valid one."""
+    try:
+        st = os.stat(path)
+        return _open(path, (st.st_mtime_ns, st.st_size))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile executive JSON into a memory-mapped snapshot.")
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--output', default=SNAPSHOT_PATH)
+    args = parser.parse_args(argv)
+    count = build_snapshot(args.data_dir, args.output)
+    print(f"Wrote {count} companies to {args.output} ({os.path.getsize(args.output):,} bytes)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
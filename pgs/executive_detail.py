@@ -1,28 +1,8 @@
 import streamlit as st
-from pgs.company_page import load_executive_data, create_org_chart, format_large_number
-import os
-import json
-from datetime import datetime
-import pandas as pd
-import yfinance as yf
-import html
-
-def load_exec_reviews():
-    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
-    file_path = os.path.join(data_dir, 'exec_reviews.json')
-    if not os.path.exists(file_path):
-        return {}
-    try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    except Exception:
-        return {}
-
-def save_exec_reviews(reviews):
-    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
-    file_path = os.path.join(data_dir, 'exec_reviews.json')
-    with open(file_path, 'w') as f:
-        json.dump(reviews, f, indent=2)
+from pgs.company_page import company_page_data, format_large_number
+from org.directory import get_directory
+from datetime import date, datetime, timedelta
+from reviews.store import get_review_store
 
 def show_executive_detail():
     
@@ -33,15 +13,18 @@ def show_executive_detail():
     st.subheader("Executive Team")
 
     ticker = st.session_state['selected_company']
-    executives = load_executive_data(ticker)
-    if executives:
-        selected_exec = st.session_state.get('selected_exec', list(executives.keys())[0])
+    directory = get_directory(ticker)
+    if directory:
+        executives = directory.executives
+        if st.session_state.get('selected_exec') not in directory:
+            st.session_state['selected_exec'] = directory.names[0]
+        selected_exec = st.session_state['selected_exec']
         # Add executive dropdown
         new_selected_exec = st.selectbox(
             "Select Executive to View Reporting Structure",
-            options=list(executives.keys()),
-            index=list(executives.keys()).index(selected_exec),
-            format_func=lambda x: f"{x} - {executives[x]['title']}"
+            options=directory.names,
+            index=directory.ids[selected_exec],
+            format_func=directory.labels.__getitem__
         )
         if new_selected_exec != selected_exec:
             st.session_state['selected_exec'] = new_selected_exec
@@ -55,19 +38,12 @@ def show_executive_detail():
         # Get current stock price
         ticker = st.session_state.get('selected_company', 'DIS')
         try:
-            stock_price = yf.Ticker(ticker).info.get('regularMarketPrice', None)
+            stock_price = company_page_data(ticker).take_quote().get('price', None)
         except Exception:
             stock_price = None
         stock_value = stock * stock_price if (stock is not None and stock_price is not None) else None
-        # Calculate total reports (all levels)
-        def count_total_reports(exec_name, executives):
-            direct = executives[exec_name].get('direct_reports', [])
-            total = len(direct)
-            for dr in direct:
-                if dr in executives:
-                    total += count_total_reports(dr, executives)
-            return total
-        total_reports = count_total_reports(selected_exec, executives)
+        # Total reports at all levels, precomputed once per company
+        total_reports = directory.hierarchy.stats(selected_exec)['total_reports']
         st.markdown("### Executive Profile")
         colA, colB, colC, colD, colE = st.columns(5)
         colA.metric("Direct Reports", num_direct_reports)
@@ -83,6 +59,7 @@ def show_executive_detail():
         history = exec_info.get('history', [])
         if history:
             with st.expander("Job History", expanded=False):
+                import pandas as pd
                 # Prefer 'title', 'start', 'duration' if present
                 ticker = st.session_state.get('selected_company', '')
                 if all('start' in h and 'duration' in h for h in history):
@@ -104,52 +81,77 @@ def show_executive_detail():
 
         # 2. Organization chart in expander
         with st.expander("Organization Chart", expanded=False):
-            org_chart = create_org_chart(executives, selected_exec)
-            selected_points = st.plotly_chart(org_chart, use_container_width=True)
-            # Handle click events
-            if selected_points:
-                try:
-                    clicked_data = selected_points.get("points", [])
-                    if clicked_data and len(clicked_data) > 0:
-                        clicked_node = clicked_data[0].get("customdata")
-                        if clicked_node and clicked_node != st.session_state['selected_exec']:
-                            st.session_state['selected_exec'] = clicked_node
-                            st.rerun()
-                except:
-                    pass
-            st.caption("💡 The selected executive is highlighted in blue. Their manager (if any) is shown above, and direct reports are shown below. Click on any node to view their information.")
+            from org.chart import get_company_chart, get_org_chart
+            chart_scope = st.radio("Show", ["Team", "Whole company"], horizontal=True, key='org_chart_scope')
+            if chart_scope == "Whole company":
+                expanded_key = f"org_expanded_{directory.ticker}"
+                expanded = st.session_state.setdefault(expanded_key, [])
+                company_chart = get_company_chart(directory, selected_exec, expanded)
+                # A fresh key per figure, so a click is handled once and not replayed on later reruns
+                event = st.plotly_chart(company_chart, use_container_width=True, on_select="rerun",
+                                        selection_mode="points",
+                                        key=f"company_org_chart_{selected_exec}_{len(expanded)}")
+                points = event.selection.points if event else []
+                if points:
+                    kind, name = points[0].get("customdata", [None, None])
+                    if kind == 'expand' and name not in expanded:
+                        st.session_state[expanded_key] = expanded + [name]
+                        st.rerun()
+                    elif kind == 'exec' and name != selected_exec:
+                        st.session_state['selected_exec'] = name
+                        st.rerun()
+                if expanded and st.button("Collapse all"):
+                    st.session_state[expanded_key] = []
+                    st.rerun()
+                st.caption("💡 Large teams are folded into grey \"+N\" nodes; click one to expand it. Click an executive to view their information.")
+            else:
+                org_chart = get_org_chart(directory, selected_exec)
+                selected_points = st.plotly_chart(org_chart, use_container_width=True)
+                # Handle click events
+                if selected_points:
+                    try:
+                        clicked_data = selected_points.get("points", [])
+                        if clicked_data and len(clicked_data) > 0:
+                            clicked_node = clicked_data[0].get("customdata")
+                            if clicked_node and clicked_node != st.session_state['selected_exec']:
+                                st.session_state['selected_exec'] = clicked_node
+                                st.rerun()
+                    except:
+                        pass
+                st.caption("💡 The selected executive is highlighted in blue. Their manager (if any) is shown above, and direct reports are shown below. Click on any node to view their information.")
     else:
         st.info("Executive information not available")
 
     # --- Executive Review Section ---
     st.markdown("---")
     st.subheader(f"Feedback for {selected_exec}")
-    # Load reviews from file
-    reviews_data = load_exec_reviews()
-    reviews = reviews_data.get(selected_exec, [])
+    # Load review statistics from the review store
+    store = get_review_store()
+    stats = store.exec_aggregates(selected_exec)
+    n_reviews = stats['count']
     # Scorecard: average rating as metric
     col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
-    if reviews:
+    if n_reviews:
         with col3:
-            avg_rating = sum(r['rating'] for r in reviews) / len(reviews)
-            # Calculate review statistics
-            unique_reviewers = len(set(r.get('reviewer', 'Anonymous') for r in reviews))
-            positive_reviews = sum(1 for r in reviews if r['rating'] >= 4)
-            neutral_reviews = sum(1 for r in reviews if r['rating'] == 3)
-            negative_reviews = sum(1 for r in reviews if r['rating'] <= 2)
+            avg_rating = stats['avg_rating']
+            # Review statistics
+            unique_reviewers = stats['unique_reviewers']
+            positive_reviews = stats['positive']
+            neutral_reviews = stats['neutral']
+            negative_reviews = stats['negative']
 
             st.metric(
                 label="Average Rating",
                 value=f"{avg_rating:.2f} / 5",
-                delta=f"{len(reviews)} review{'s' if len(reviews)!=1 else ''}",
+                delta=f"{n_reviews} review{'s' if n_reviews!=1 else ''}",
                 help="Average of all user ratings"
             )
         with col4:
             st.metric(
                 label="Unique Reviewers",
-                value=f"{unique_reviewers} / {len(reviews)}",
-                delta=f"{'high' if unique_reviewers/len(reviews) < 0.3 else 'moderate' if unique_reviewers/len(reviews) < 0.5 else 'low'} bias - {len(reviews)-unique_reviewers} repeats",
-                delta_color="inverse" if unique_reviewers/len(reviews) < 0.5 else "normal",
+                value=f"{unique_reviewers} / {n_reviews}",
+                delta=f"{'high' if unique_reviewers/n_reviews < 0.3 else 'moderate' if unique_reviewers/n_reviews < 0.5 else 'low'} bias - {n_reviews-unique_reviewers} repeats",
+                delta_color="inverse" if unique_reviewers/n_reviews < 0.5 else "normal",
                 help="Number of different people who have reviewed"
             )
         with col1:
@@ -160,11 +162,41 @@ def show_executive_detail():
                 help="Positive (4-5) | Neutral (3) | Negative (1-2)"
             )
         
+        with col2:
+            # Last 30 days from the daily rollups, compared with everything before
+            recent = store.recent_stats(selected_exec)
+            earlier = n_reviews - recent['count']
+            if recent['count']:
+                st.metric(
+                    label="Last 30 Days",
+                    value=f"{recent['avg_rating']:.2f} / 5",
+                    delta=(f"{recent['avg_rating'] - (stats['rating_sum'] - recent['rating_sum']) / earlier:+.2f} vs. earlier"
+                           if earlier else f"{recent['count']} new review{'s' if recent['count'] != 1 else ''}"),
+                    help=f"{recent['count']} review{'s' if recent['count'] != 1 else ''} in the last 30 days: "
+                         f"👍 {recent['positive']} | 😐 {recent['neutral']} | 👎 {recent['negative']}"
+                )
+            else:
+                st.metric(label="Last 30 Days", value="No reviews", help="No reviews in the last 30 days")
+
+        with st.expander("📈 Rating Trend"):
+            trend_col1, trend_col2 = st.columns(2)
+            with trend_col1:
+                grain = st.radio("Buckets", options=['week', 'day'], format_func=str.title, horizontal=True,
+                                 key=f"trend_grain_{selected_exec}")
+            from reviews.chart import SPLITS, create_rating_trend_chart
+            with trend_col2:
+                split = st.selectbox("Split by", options=list(SPLITS), key=f"trend_split_{selected_exec}")
+            # Daily buckets cover the last 90 days; weekly ones the whole history
+            since = (date.today() - timedelta(days=89)).isoformat() if grain == 'day' else None
+            rollups = store.rating_rollups(selected_exec, grain, since)
+            if rollups:
+                st.plotly_chart(create_rating_trend_chart(rollups, SPLITS[split]), use_container_width=True)
+            else:
+                st.caption("No dated reviews in this period.")
     else:
         st.metric(label="Average Rating", value="No ratings yet", delta="0 reviews")
         st.metric(label="Unique Reviewers", value="0")
         st.metric(label="Review Sentiment", value="No reviews yet")
-    # with col2:
     @st.dialog(f"Add review for {selected_exec}")
     def vote(item):
         new_rating = st.feedback("stars", key=f"rating_{selected_exec}")
@@ -175,17 +207,21 @@ def show_executive_detail():
             key=f"relationship_{selected_exec}"
         )
         new_review = st.text_area("Your Review", key=f"review_{selected_exec}")
+        reviewer = st.text_input(
+            "Your name", value=st.session_state.get('reviewer_name', ''), placeholder="Anonymous",
+            key=f"reviewer_{selected_exec}", help="Leave empty to post anonymously"
+        ).strip()
         if st.button("Submit Review", key=f"submit_{selected_exec}", type="primary"):
             if new_review.strip() and new_rating:
-                reviews_data.setdefault(selected_exec, []).append({
+                st.session_state['reviewer_name'] = reviewer
+                store.add_review(selected_exec, {
                     'rating': new_rating,
                     'review': new_review.strip(),
                     'timestamp': datetime.now().isoformat(sep=' ', timespec='minutes'),
-                    'reviewer': reviewer,
+                    'reviewer': reviewer or 'Anonymous',
                     'is_current_employee': is_current_employee,
                     'relationship': relationship
                 })
-                save_exec_reviews(reviews_data)
                 st.success("Thank you for your feedback!")
                 st.rerun()
             else:
@@ -197,57 +233,33 @@ def show_executive_detail():
             vote("A")
 
     st.markdown("**Reviews:**")
-    # Pagination logic
+    # Pagination logic: the cursor is (direction, review id), None for the newest page
     REVIEWS_PER_PAGE = 5
-    total_reviews = len(reviews)
-    total_pages = max(1, (total_reviews + REVIEWS_PER_PAGE - 1) // REVIEWS_PER_PAGE)
-    page_key = f"review_page_{selected_exec}"
-    if page_key not in st.session_state:
-        st.session_state[page_key] = 1
-    page = st.session_state[page_key]
-    start_idx = (page - 1) * REVIEWS_PER_PAGE
-    end_idx = start_idx + REVIEWS_PER_PAGE
-    if reviews:
-        for r in list(reversed(reviews))[start_idx:end_idx]:
-            ts = r.get('timestamp', '')
-            reviewer = r.get('reviewer', 'Anonymous')
-            stars = ''.join([
-                f'<span style="color:#FFD600;font-size:1.2em;">&#9733;</span>' if i < r['rating'] else
-                f'<span style="color:#444;font-size:1.2em;">&#9733;</span>'
-                for i in range(5)
-            ])
-            profile_img = "https://ui-avatars.com/api/?name=" + reviewer.replace(" ", "+") + "&background=0D8ABC&color=fff&size=64"
-            # Count total reviews by this reviewer across all execs
-            all_reviews = sum([len([rv for rv in rvlist if rv.get('reviewer') == reviewer]) for rvlist in reviews_data.values()], 0)
-            subtitle = f"DIS at time of review · {all_reviews} review{'s' if all_reviews != 1 else ''}"
-            review_html = f'''
-            <div style="background:#1a2b38; color:#e6f0fa; border-radius:12px; padding:12px 16px; margin-bottom:12px; box-sizing:border-box;">
-                <div style="display:flex; align-items:flex-start;">
-                    <img src="{profile_img}" style="width:48px; height:48px; border-radius:50%; margin-right:14px; margin-top:2px;">
-                    <div style="flex:1;">
-                        <div style="font-size:1.1em; font-weight:bold;">{reviewer}</div>
-                        <div style="font-size:0.97em; color:#b0b8c1; margin-bottom:2px;">{subtitle}</div>
-                    </div>
-                </div>
-                <div style="display:inline-block;">{stars}</div>
-                <span style="font-size:0.95em; color:#b0b8c1; margin-left:10px;">{ts}</span>
-                <div style="font-size:1.08em; color:#e6f0fa; text-align:left; white-space:pre-line;">{html.escape(r['review'])}</div>
-            </div>
-            '''
-            st.markdown(review_html, unsafe_allow_html=True)
+    cursor_key = f"review_cursor_{selected_exec}"
+    cursor = st.session_state.get(cursor_key)
+    page = store.reviews_page(
+        selected_exec,
+        REVIEWS_PER_PAGE,
+        before=cursor[1] if cursor and cursor[0] == 'before' else None,
+        after=cursor[1] if cursor and cursor[0] == 'after' else None,
+    )
+    if page.reviews:
+        # Cards are rendered once per review (see reviews.cards) and sent as a single element
+        from reviews.cards import render_review_cards
+        st.markdown(render_review_cards(page.reviews, ticker, store.count_by_reviewer), unsafe_allow_html=True)
         # Pagination controls
         col_prev, col_page, col_next = st.columns([1,2,1])
         with col_prev:
-            if page > 1:
+            if page.newer is not None:
                 if st.button("Previous", key=f"prev_{selected_exec}"):
-                    st.session_state[page_key] -= 1
+                    st.session_state[cursor_key] = ('after', page.newer)
                     st.rerun()
         with col_page:
-            st.markdown(f"Page {page} of {total_pages}")
+            st.markdown(f"{n_reviews} review{'s' if n_reviews != 1 else ''}")
         with col_next:
-            if page < total_pages:
+            if page.older is not None:
                 if st.button("Next", key=f"next_{selected_exec}"):
-                    st.session_state[page_key] += 1
+                    st.session_state[cursor_key] = ('before', page.older)
                     st.rerun()
     else:
         st.markdown("No reviews yet.")
\ No newline at end of file
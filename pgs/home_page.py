@@ -1,21 +1,16 @@
 import streamlit as st
-import json
-
-def load_sp500_companies():
-    """Load S&P 500 companies from the JSON file."""
-    with open('sp500_companies.json', 'r') as file:
-        companies = json.load(file)
-    return companies
+from companies.catalog import get_catalog
+from org.search import get_executive_search
+from companies.page_data import prefetch_company
 
 def show_home_page():
     st.title("📝 The Sticky Note")
     st.caption("For the people, by the people.")
     
     # Load and display company selection
-    companies = load_sp500_companies()
-    # Create a list of tuples (ticker, name) for the selectbox
-    company_options = [(ticker, f"{ticker} - {name}") for ticker, name in companies.items()]
-    company_options.sort(key=lambda x: x[1])  # Sort by the display string
+    catalog = get_catalog()
+    query = st.text_input("Search companies", placeholder="Ticker or company name, e.g. DIS or Disney")
+    company_options = catalog.search(query) if query.strip() else catalog.tickers
     
     # Create two columns
     col1, col2 = st.columns(2)
@@ -23,10 +18,10 @@ def show_home_page():
     with col1:
         selected_company = st.selectbox(
             "Select your company",
-            options=[opt[0] for opt in company_options],
-            format_func=lambda x: next(opt[1] for opt in company_options if opt[0] == x),
-            index=None,
-            placeholder="Choose a company..."
+            options=company_options,
+            format_func=catalog.labels.__getitem__,
+            index=0 if query.strip() and company_options else None,
+            placeholder="Choose a company..." if company_options else "No matching companies"
         )
 
     with col2:
@@ -40,9 +35,33 @@ def show_home_page():
     if selected_company and role:
         verb = "Join" if role == "Contributor" else "View"
         if st.button(f"{verb} the revolution"):
+            # Start loading the company's data now so it overlaps with the page switch
+            st.session_state['page_data'] = prefetch_company(selected_company)
             # Store the selected company and role in session state
             st.session_state['selected_company'] = selected_company
-            st.session_state['company_name'] = companies[selected_company]
+            st.session_state['company_name'] = catalog.names[selected_company]
             st.session_state['role'] = role
             st.session_state['page'] = 'company_page'
-            st.rerun() 
\ No newline at end of file
+            st.rerun()
+
+    if st.button("📊 Compare all S&P 500 companies"):
+        st.session_state['page'] = 'leaderboard'
+        st.rerun()
+
+    # Search executives across every company with executive data
+    st.markdown("---")
+    exec_query = st.text_input("Find an executive", placeholder="Name, title or keyword, e.g. chief financial officer")
+    if exec_query.strip():
+        hits = get_executive_search().search(exec_query)
+        if not hits:
+            st.caption("No matching executives")
+        for hit in hits:
+            company = catalog.names.get(hit.ticker, hit.ticker)
+            if st.button(f"{hit.name} - {hit.title} ({company})", key=f"exec_hit_{hit.ticker}_{hit.name}"):
+                st.session_state['page_data'] = prefetch_company(hit.ticker)
+                st.session_state['selected_company'] = hit.ticker
+                st.session_state['company_name'] = company
+                st.session_state['role'] = role or "Viewer"
+                st.session_state['selected_exec'] = hit.name
+                st.session_state['page'] = 'executive_detail'
+                st.rerun()
@@ -0,0 +1,64 @@
+import streamlit as st
+from datetime import datetime
+from companies.page_data import prefetch_company
+from market.fundamentals import METRICS, compute_metrics, load_fundamentals
+
+def show_leaderboard():
+    if st.button("<- Company Selection"):
+        st.session_state['page'] = 'home'
+        st.rerun()
+    st.title("📊 S&P 500 Leaderboard")
+
+    table = load_fundamentals()
+    if table is None:
+        st.info("The fundamentals table hasn't been built yet. Run `python -m market.warmup` or `python -m market.fundamentals --fetch`.")
+        return
+    st.caption(f"Fundamentals as of {datetime.fromtimestamp(table.attrs['built_at']):%Y-%m-%d %H:%M}")
+    metrics = compute_metrics(table)
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        query = st.text_input("Filter companies", placeholder="Ticker or name")
+    with col2:
+        sort_by = st.selectbox("Sort by", METRICS)
+    with col3:
+        descending = st.toggle("Highest first", value=True)
+    only_complete = st.checkbox("Only companies with fundamentals", value=True)
+
+    # Filtering and sorting are column operations over the whole table
+    mask = metrics['totalRevenue'].notna() if only_complete else metrics['ticker'].notna()
+    if query.strip():
+        q = query.strip()
+        mask &= metrics['ticker'].str.contains(q, case=False, regex=False) | metrics['name'].str.contains(q, case=False, regex=False)
+    view = metrics[mask].sort_values(sort_by, ascending=not descending, na_position='last')
+
+    columns = ['ticker', 'name'] + [c for m in METRICS for c in (m, f'{m} pct')]
+    money = st.column_config.NumberColumn(format="$%.0f")
+    pct = st.column_config.NumberColumn(format="%.2f%%")
+    st.dataframe(
+        view[columns],
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'ticker': "Ticker",
+            'name': "Company",
+            'Revenue/Employee': money,
+            'Avg Exec Comp': money,
+            'Executive Ratio %': st.column_config.NumberColumn(format="%.4f%%"),
+            'Profit Margin %': pct,
+            'Operating Margin %': pct,
+            **{f'{m} pct': st.column_config.ProgressColumn(f"{m} percentile", format="%.0f", min_value=0, max_value=100)
+               for m in METRICS},
+        },
+    )
+    st.caption(f"{len(view)} of {len(metrics)} companies")
+
+    # Jump to a company's page
+    ticker = st.selectbox("Open company", options=list(view['ticker']), index=None, placeholder="Choose a company...")
+    if ticker and st.button("View company"):
+        st.session_state['page_data'] = prefetch_company(ticker)
+        st.session_state['selected_company'] = ticker
+        st.session_state['company_name'] = str(view.loc[view['ticker'] == ticker, 'name'].iloc[0])
+        st.session_state.setdefault('role', "Viewer")
+        st.session_state['page'] = 'company_page'
+        st.rerun()
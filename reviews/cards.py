@@ -0,0 +1,74 @@
+import hashlib
+import html
+from urllib.parse import quote_plus
+
+from reviews.store import reviewer_key
+from utils import LRUCache
+
+CARD_CACHE_SIZE = 4096
+
+_STAR = '<span style="color:{};font-size:1.2em;">&#9733;</span>'
+STARS = [_STAR.format('#FFD600') * n + _STAR.format('#444') * (5 - n) for n in range(6)]  # by rating
+
+CARD_TEMPLATE = '''
+<div style="background:#1a2b38; color:#e6f0fa; border-radius:12px; padding:12px 16px; margin-bottom:12px; box-sizing:border-box;">
+    <div style="display:flex; align-items:flex-start;">
+        <img src="https://ui-avatars.com/api/?name={avatar}&background=0D8ABC&color=fff&size=64" style="width:48px; height:48px; border-radius:50%; margin-right:14px; margin-top:2px;">
+        <div style="flex:1;">
+            <div style="font-size:1.1em; font-weight:bold;">{reviewer}</div>
+            <div style="font-size:0.97em; color:#b0b8c1; margin-bottom:2px;">{subtitle}</div>
+        </div>
+    </div>
+    <div style="display:inline-block;">{stars}</div>
+    <span style="font-size:0.95em; color:#b0b8c1; margin-left:10px;">{timestamp}</span>
+    <div style="font-size:1.08em; color:#e6f0fa; text-align:left; white-space:pre-line;">{text}</div>
+</div>
+'''
+
+
+def content_hash(review):
+    """Digest of the fields a review card shows."""
+    fields = (str(review['rating']), reviewer_key(review), review.get('timestamp', ''), review['review'])
+    return hashlib.blake2b('\0'.join(fields).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def render_card(review, ticker, reviewer_reviews):
+    """HTML for one review card; every user-supplied field is escaped.
+
+    Newlines in the review become character references: a blank line would
+    otherwise end the markdown HTML block in the middle of the card.
+    """
+    reviewer = reviewer_key(review)
+    return CARD_TEMPLATE.format(
+        avatar=html.escape(quote_plus(reviewer)),
+        reviewer=html.escape(reviewer),
+        subtitle=html.escape(
+            f"{ticker} at time of review · {reviewer_reviews} review{'s' if reviewer_reviews != 1 else ''}"
+        ),
+        stars=STARS[int(review['rating'])],
+        timestamp=html.escape(review.get('timestamp', '')),
+        text=html.escape(review['review']).replace('\n', '&#10;'),
+    )
+
+
+_cache = LRUCache(CARD_CACHE_SIZE)  # (review id, content hash, ticker, reviewer's review count) -> card HTML
+
+
+def get_card(review, ticker, reviewer_reviews):
+    """``render_card``, memoized in a process-wide LRU shared by all sessions."""
+    key = (review.get('id'), content_hash(review), ticker, reviewer_reviews)
+    return _cache.get_or_build(key, render_card, review, ticker, reviewer_reviews)
+
+
+def render_review_cards(reviews, ticker, count_by_reviewer):
+    """One HTML block with a card per review, for a single ``st.markdown`` call.
+
+    ``count_by_reviewer`` looks up how many reviews a reviewer has written;
+    it is called once per distinct reviewer on the page.
+    """
+    counts = {}
+    for review in reviews:
+        reviewer = reviewer_key(review)
+        if reviewer not in counts:
+            counts[reviewer] = count_by_reviewer(reviewer)
+    return ''.join(get_card(review, ticker, counts[reviewer_key(review)]) for review in reviews)
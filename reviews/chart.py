@@ -0,0 +1,61 @@
+import plotly.graph_objects as go
+
+SPLITS = {
+    'Nothing': None,
+    'Relationship': 'relationship',
+    'Current employee': 'is_current_employee',
+}
+_EMPLOYEE_LABELS = {True: "Current employee", False: "Not a current employee", None: "Not given"}
+
+
+def _group(row, split):
+    if split == 'relationship':
+        return row.relationship or "Not given"
+    if split == 'is_current_employee':
+        return _EMPLOYEE_LABELS[row.is_current_employee]
+    return "All reviews"
+
+
+def create_rating_trend_chart(rows, split=None):
+    """Average rating per bucket over the review counts, from ``RollupRow``s (oldest bucket first).
+
+    ``split`` ('relationship' or 'is_current_employee') draws one rating line
+    per group instead of a single one.
+    """
+    totals = {}  # bucket -> reviews
+    groups = {}  # group -> bucket -> [reviews, rating sum]
+    for row in rows:
+        count = sum(row.histogram)
+        totals[row.bucket] = totals.get(row.bucket, 0) + count
+        cell = groups.setdefault(_group(row, split), {}).setdefault(row.bucket, [0, 0])
+        cell[0] += count
+        cell[1] += sum(i * n for i, n in enumerate(row.histogram))
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=list(totals),
+        y=list(totals.values()),
+        name='Reviews',
+        yaxis='y2',
+        opacity=0.3,
+        marker_color='rgb(158, 202, 225)',
+    ))
+    for label, cells in sorted(groups.items()):
+        fig.add_trace(go.Scatter(
+            x=list(cells),
+            y=[rating_sum / count for count, rating_sum in cells.values()],
+            customdata=[count for count, _ in cells.values()],
+            mode='lines+markers',
+            name=label,
+            hovertemplate="%{x}: %{y:.2f} / 5 from %{customdata} review(s)<extra>" + label + "</extra>",
+        ))
+    fig.update_layout(
+        yaxis=dict(title='Average Rating', range=[0, 5.2]),
+        yaxis2=dict(title='Reviews', overlaying='y', side='right', showgrid=False, rangemode='tozero'),
+        xaxis=dict(type='date'),
+        legend=dict(orientation='h', y=-0.2),
+        margin=dict(l=20, r=20, t=20, b=20),
+        height=320,
+        template='plotly_white',
+    )
+    return fig
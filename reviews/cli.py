@@ -0,0 +1,44 @@
+"""Maintenance commands for the review store.
+
+    python -m reviews.cli migrate
+    python -m reviews.cli rebuild-aggregates [--backend log]
+"""
+import argparse
+import os
+import sys
+
+from reviews.store import REVIEW_BACKEND, get_review_store
+from settings import DATA_DIR
+
+
+def migrate(args):
+    from reviews.sqlite_store import SqliteReviewStore
+    store = SqliteReviewStore(os.path.join(args.data_dir, 'exec_reviews.db'))
+    print(f"Imported {store.migrate_from_json(args.data_dir)} reviews")
+    return 0
+
+
+def rebuild_aggregates(args):
+    store = get_review_store(args.backend, args.data_dir)
+    mismatched = store.rebuild_aggregates()
+    for exec_name in mismatched:
+        print(f"Aggregate mismatch: {exec_name}")
+    print(f"Rebuilt aggregates ({len(mismatched)} mismatched)")
+    return 1 if mismatched else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Review store maintenance.")
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--backend', default=REVIEW_BACKEND, choices=['sqlite', 'log'])
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('migrate', help="Import exec_reviews.json into the SQLite store (once)").set_defaults(func=migrate)
+    commands.add_parser(
+        'rebuild-aggregates', help="Recompute per-executive aggregates and rating rollups, and report any drift"
+    ).set_defaults(func=rebuild_aggregates)
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,289 @@
+import bisect
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process mutex only
+    fcntl = None
+
+from reviews.store import RatingAggregate, RatingRollups, ReviewPage, ReviewStore, make_stats, reviewer_key
+from settings import DATA_DIR
+
+COMPACT_EVERY = 1000
+
+
+def _file_id(path):
+    """Identify a file version by inode, mtime and size, or None if missing."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class ReviewLog(ReviewStore):
+    """Append-only review log that is periodically compacted into a JSON snapshot.
+
+    The snapshot keeps the original ``exec_reviews.json`` layout
+    (executive name -> list of reviews). New reviews are appended as one JSON
+    record per line to ``exec_reviews.log`` and fsync'd, so a submit costs the
+    same no matter how many reviews exist. An exclusive ``flock`` on
+    ``exec_reviews.lock`` serializes writers across processes; readers take a
+    shared lock and only parse log lines they have not seen yet.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, compact_every=COMPACT_EVERY):
+        self.snapshot_path = os.path.join(data_dir, 'exec_reviews.json')
+        self.log_path = os.path.join(data_dir, 'exec_reviews.log')
+        self.lock_path = os.path.join(data_dir, 'exec_reviews.lock')
+        self.compact_every = compact_every
+        self._mutex = threading.Lock()
+        self._reviews = {}
+        self._aggregates = {}
+        self._rollups = {}
+        self._activity = {}
+        self._last_id = 0
+        self._snapshot_last_id = 0
+        self._snapshot_id = None
+        self._log_offset = 0
+        self._log_records = 0
+        self._compactor = None
+
+    @contextmanager
+    def _locked(self, exclusive):
+        with self._mutex:
+            with open(self.lock_path, 'a') as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _apply(self, exec_name, review):
+        self._reviews.setdefault(exec_name, []).append(review)
+        self._aggregates.setdefault(exec_name, RatingAggregate()).add(review)
+        self._rollups.setdefault(exec_name, RatingRollups()).add(review)
+        self._activity.setdefault(reviewer_key(review), []).append(
+            (review['id'], exec_name, review.get('timestamp', ''))
+        )
+        self._last_id = max(self._last_id, review['id'])
+
+    def _load_snapshot(self):
+        self._reviews = {}
+        self._aggregates = {}
+        self._rollups = {}
+        self._activity = {}
+        self._last_id = 0
+        self._log_offset = 0
+        self._log_records = 0
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                snapshot = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            snapshot = {}
+        # Reviews written before the log existed carry no id; number them in
+        # file order after the highest existing id so every process agrees.
+        next_id = max((r.get('id', 0) for rs in snapshot.values() for r in rs), default=0)
+        for exec_name, reviews in snapshot.items():
+            for review in reviews:
+                if 'id' not in review:
+                    next_id += 1
+                    review = dict(review, id=next_id)
+                self._apply(exec_name, review)
+        # The snapshot groups reviews by executive; keep activity in id order.
+        for entries in self._activity.values():
+            entries.sort()
+        self._snapshot_last_id = self._last_id
+
+    def _read_log(self):
+        try:
+            with open(self.log_path, 'rb') as f:
+                f.seek(self._log_offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return
+        # Only consume complete lines; a trailing partial line is a write in
+        # progress or a torn write from a crashed process.
+        end = chunk.rfind(b'\n') + 1
+        for line in chunk[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._log_records += 1
+            # A crash between writing the snapshot and truncating the log
+            # leaves records the snapshot already contains.
+            if record['review']['id'] <= self._snapshot_last_id:
+                continue
+            self._apply(record['exec'], record['review'])
+        self._log_offset += end
+
+    def _refresh(self):
+        """Bring the in-memory view up to date with the files on disk."""
+        snapshot_id = _file_id(self.snapshot_path)
+        log_id = _file_id(self.log_path)
+        log_size = log_id[2] if log_id else 0
+        if snapshot_id != self._snapshot_id or log_size < self._log_offset:
+            self._load_snapshot()
+            self._snapshot_id = snapshot_id
+        self._read_log()
+
+    def add_review(self, exec_name, review):
+        """Durably append a review for an executive and return it with its id."""
+        with self._locked(exclusive=True):
+            self._refresh()
+            # Drop any torn write left behind by a crashed writer.
+            if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > self._log_offset:
+                os.truncate(self.log_path, self._log_offset)
+            review = dict(review, id=self._last_id + 1)
+            line = (json.dumps({'exec': exec_name, 'review': review}) + '\n').encode('utf-8')
+            with open(self.log_path, 'ab') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._log_offset += len(line)
+            self._log_records += 1
+            self._apply(exec_name, review)
+            if self._log_records >= self.compact_every and not (self._compactor and self._compactor.is_alive()):
+                # Compact off the request path, so this submit costs the same as any other.
+                self._compactor = threading.Thread(target=self.compact, daemon=True)
+                self._compactor.start()
+        return review
+
+    def compact(self):
+        """Fold the log into the snapshot and truncate it.
+
+        The snapshot is written without holding the lock; writers only wait
+        for the two renames at the end. Records appended meanwhile are carried
+        over into the new log.
+        """
+        with self._locked(exclusive=True):
+            self._refresh()
+            reviews = {exec_name: list(rs) for exec_name, rs in self._reviews.items()}
+            snapshot_id = self._snapshot_id
+            last_id = self._last_id
+            offset = self._log_offset
+        suffix = f'.{os.getpid()}.{threading.get_ident()}.tmp'
+        tmp_path = self.snapshot_path + suffix
+        with open(tmp_path, 'w') as f:
+            json.dump(reviews, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        with self._locked(exclusive=True):
+            self._refresh()
+            if self._snapshot_id != snapshot_id:
+                # Another process compacted first.
+                os.remove(tmp_path)
+                return
+            tail = b''
+            if self._log_offset > offset:
+                with open(self.log_path, 'rb') as f:
+                    f.seek(offset)
+                    tail = f.read(self._log_offset - offset)
+            log_tmp_path = self.log_path + suffix
+            with open(log_tmp_path, 'wb') as f:
+                f.write(tail)
+                f.flush()
+                os.fsync(f.fileno())
+            # A crash between the two renames leaves log records the snapshot
+            # already contains; _read_log skips them by id.
+            os.replace(tmp_path, self.snapshot_path)
+            os.replace(log_tmp_path, self.log_path)
+            self._snapshot_id = _file_id(self.snapshot_path)
+            self._snapshot_last_id = last_id
+            self._log_offset = len(tail)
+            self._log_records = tail.count(b'\n')
+
+    def _snapshot(self):
+        with self._locked(exclusive=False):
+            self._refresh()
+            return self._reviews
+
+    def reviews_for(self, exec_name):
+        """Return the reviews for one executive, oldest first."""
+        return list(self._snapshot().get(exec_name, []))
+
+    def iter_reviews(self):
+        # Merge per-executive lists back into global insertion order.
+        reviews = self._snapshot()
+        pairs = [(r['id'], name, r) for name, rs in list(reviews.items()) for r in rs]
+        for _, name, review in sorted(pairs, key=lambda p: p[0]):
+            yield name, review
+
+    def count_reviews(self, exec_name):
+        return len(self._snapshot().get(exec_name, []))
+
+    def reviews_page(self, exec_name, limit, before=None, after=None):
+        # Each executive's list is in ascending id order, so a cursor is a bisect.
+        with self._locked(exclusive=False):
+            self._refresh()
+            reviews = self._reviews.get(exec_name, [])
+            if after is not None:
+                start = bisect.bisect_right(reviews, after, key=lambda r: r['id'])
+                # Near the top, show a full newest page rather than a short one.
+                end = min(len(reviews), start + limit)
+                start = max(0, end - limit)
+            else:
+                end = len(reviews) if before is None else bisect.bisect_left(reviews, before, key=lambda r: r['id'])
+                start = max(0, end - limit)
+            page = reviews[start:end][::-1]
+        older = page[-1]['id'] if page and start > 0 else None
+        newer = page[0]['id'] if page and end < len(reviews) else None
+        return ReviewPage(page, older, newer)
+
+    def count_by_reviewer(self, reviewer):
+        with self._locked(exclusive=False):
+            self._refresh()
+            return len(self._activity.get(reviewer, ()))
+
+    def reviewer_activity(self, reviewer, limit=None):
+        with self._locked(exclusive=False):
+            self._refresh()
+            entries = self._activity.get(reviewer, [])
+            entries = entries if limit is None else entries[-limit:] if limit else []
+            return [(exec_name, timestamp) for _, exec_name, timestamp in reversed(entries)]
+
+    def exec_aggregates(self, exec_name):
+        with self._locked(exclusive=False):
+            self._refresh()
+            aggregate = self._aggregates.get(exec_name)
+        return aggregate.stats() if aggregate else make_stats(0, 0, [0] * 6, 0)
+
+    def rating_rollups(self, exec_name, grain='week', since=None):
+        with self._locked(exclusive=False):
+            self._refresh()
+            rollups = self._rollups.get(exec_name)
+            return rollups.rows(grain, since) if rollups else []
+
+    def rebuild_aggregates(self):
+        with self._locked(exclusive=False):
+            self._refresh()
+            rebuilt = {}
+            rollups = {}
+            activity = {}
+            for exec_name, reviews in self._reviews.items():
+                aggregate = rebuilt[exec_name] = RatingAggregate()
+                rollup = rollups[exec_name] = RatingRollups()
+                for review in reviews:
+                    aggregate.add(review)
+                    rollup.add(review)
+                    activity.setdefault(reviewer_key(review), []).append(
+                        (review['id'], exec_name, review.get('timestamp', ''))
+                    )
+            for entries in activity.values():
+                entries.sort()
+            mismatched = sorted(
+                name for name in set(rebuilt) | set(self._aggregates)
+                if name not in rebuilt or name not in self._aggregates
+                or rebuilt[name].stats() != self._aggregates[name].stats()
+                or rollups[name].cells != self._rollups[name].cells
+            )
+            self._aggregates = rebuilt
+            self._rollups = rollups
+            self._activity = activity
+        return mismatched
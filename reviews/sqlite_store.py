@@ -0,0 +1,323 @@
+import sqlite3
+import threading
+
+from reviews.store import ReviewPage, RollupRow, ReviewStore, make_stats, reviewer_key
+from settings import DATA_DIR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    exec_name TEXT NOT NULL,
+    rating INTEGER NOT NULL,
+    review TEXT NOT NULL,
+    timestamp TEXT NOT NULL DEFAULT '',
+    reviewer TEXT,
+    is_current_employee INTEGER,
+    relationship TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_exec ON reviews (exec_name, id);
+CREATE INDEX IF NOT EXISTS idx_reviews_exec_time ON reviews (exec_name, timestamp);
+CREATE INDEX IF NOT EXISTS idx_reviews_reviewer_id ON reviews (reviewer, id);
+CREATE TABLE IF NOT EXISTS exec_stats (
+    exec_name TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    r0 INTEGER NOT NULL DEFAULT 0,
+    r1 INTEGER NOT NULL DEFAULT 0,
+    r2 INTEGER NOT NULL DEFAULT 0,
+    r3 INTEGER NOT NULL DEFAULT 0,
+    r4 INTEGER NOT NULL DEFAULT 0,
+    r5 INTEGER NOT NULL DEFAULT 0,
+    distinct_reviewers INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS exec_reviewers (
+    exec_name TEXT NOT NULL,
+    reviewer TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (exec_name, reviewer)
+);
+CREATE TABLE IF NOT EXISTS reviewer_stats (
+    reviewer TEXT PRIMARY KEY,
+    n INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exec_rollups (
+    exec_name TEXT NOT NULL,
+    grain TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    relationship TEXT NOT NULL DEFAULT '',
+    is_current_employee INTEGER NOT NULL DEFAULT -1,
+    r0 INTEGER NOT NULL DEFAULT 0,
+    r1 INTEGER NOT NULL DEFAULT 0,
+    r2 INTEGER NOT NULL DEFAULT 0,
+    r3 INTEGER NOT NULL DEFAULT 0,
+    r4 INTEGER NOT NULL DEFAULT 0,
+    r5 INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (exec_name, grain, bucket, relationship, is_current_employee)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Bump when a maintained table is added so existing databases are backfilled.
+AGGREGATES_VERSION = '1'
+
+MAX_ID = 2 ** 63 - 1
+
+HISTOGRAM = ('r0', 'r1', 'r2', 'r3', 'r4', 'r5')
+
+# Bucket key of a review's timestamp per grain: the day, or the Monday
+# starting its week. NULL for reviews without a date, which are not rolled up.
+# Rollup keys can't be NULL (NULLs never conflict), so unset relationship and
+# current-employee flags are stored as '' and -1.
+BUCKET_SQL = {
+    'day': "date(substr(timestamp, 1, 10))",
+    'week': "date(substr(timestamp, 1, 10), 'weekday 0', '-6 days')",
+}
+
+
+def _rollup_insert(grain, histogram, where):
+    """INSERT ... SELECT adding the dated reviews matching ``where`` to ``grain``'s rollup rows."""
+    bucket = BUCKET_SQL[grain]
+    return (
+        f"INSERT INTO exec_rollups (exec_name, grain, bucket, relationship, is_current_employee, {', '.join(HISTOGRAM)})"
+        f" SELECT exec_name, '{grain}', {bucket}, COALESCE(relationship, ''), COALESCE(is_current_employee, -1),"
+        f" {histogram} FROM reviews WHERE {where} AND {bucket} IS NOT NULL"
+    )
+
+
+# Adds one review (by id) to its rollup rows, inside the inserting transaction.
+ROLLUP_ADD_SQL = [
+    _rollup_insert(grain, ", ".join(f"rating = {i}" for i in range(6)), "id = ?")
+    + " ON CONFLICT (exec_name, grain, bucket, relationship, is_current_employee) DO UPDATE SET "
+    + ", ".join(f"{c} = {c} + excluded.{c}" for c in HISTOGRAM)
+    for grain in BUCKET_SQL
+]
+
+# Recomputes exec_stats / exec_reviewers / reviewer_stats / exec_rollups from the raw reviews table.
+REBUILD_SQL = """
+DELETE FROM exec_reviewers;
+DELETE FROM exec_stats;
+DELETE FROM reviewer_stats;
+INSERT INTO exec_reviewers (exec_name, reviewer, n)
+    SELECT exec_name, COALESCE(NULLIF(reviewer, ''), 'Anonymous'), COUNT(*) FROM reviews GROUP BY 1, 2;
+INSERT INTO exec_stats (exec_name, count, rating_sum, r0, r1, r2, r3, r4, r5, distinct_reviewers)
+    SELECT r.exec_name, COUNT(*), SUM(rating),
+           SUM(rating = 0), SUM(rating = 1), SUM(rating = 2), SUM(rating = 3), SUM(rating = 4), SUM(rating = 5),
+           (SELECT COUNT(*) FROM exec_reviewers er WHERE er.exec_name = r.exec_name)
+    FROM reviews r GROUP BY r.exec_name;
+INSERT INTO reviewer_stats (reviewer, n)
+    SELECT reviewer, SUM(n) FROM exec_reviewers GROUP BY reviewer;
+DELETE FROM exec_rollups;
+""" + "".join(
+    _rollup_insert(grain, ", ".join(f"SUM(rating = {i})" for i in range(6)), "1") + " GROUP BY 1, 3, 4, 5;\n"
+    for grain in BUCKET_SQL
+)
+
+COLUMNS = ('id', 'rating', 'review', 'timestamp', 'reviewer', 'is_current_employee', 'relationship')
+
+
+def _stats_from_row(row):
+    if row is None:
+        return make_stats(0, 0, [0] * 6, 0)
+    return make_stats(row['count'], row['rating_sum'], [row[c] for c in HISTOGRAM], row['distinct_reviewers'])
+
+
+def _row_to_rollup(row):
+    return RollupRow(
+        row['bucket'],
+        row['relationship'] or None,
+        None if row['is_current_employee'] == -1 else bool(row['is_current_employee']),
+        [row[c] for c in HISTOGRAM],
+    )
+
+
+def _row_to_review(row):
+    review = {k: row[k] for k in COLUMNS if row[k] is not None}
+    if 'is_current_employee' in review:
+        review['is_current_employee'] = bool(review['is_current_employee'])
+    return review
+
+
+class SqliteReviewStore(ReviewStore):
+    """Review store backed by SQLite in WAL mode.
+
+    Every page query is answered from an index on ``(exec_name, id)`` or
+    ``reviewer``, so latency and memory do not depend on the total number of
+    reviews. Per-executive rating aggregates live in ``exec_stats``, and
+    day/week rating rollups in ``exec_rollups``; both are updated in the same
+    transaction as each insert. Each thread gets its own connection; WAL lets
+    Streamlit sessions read while another one writes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+        # Databases created before the current maintained tables existed need one backfill.
+        conn = self._conn()
+        row = conn.execute("SELECT value FROM meta WHERE key = 'aggregates_version'").fetchone()
+        if row is None or row[0] != AGGREGATES_VERSION:
+            self.rebuild_aggregates()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('aggregates_version', ?)", (AGGREGATES_VERSION,)
+                )
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _insert(self, conn, exec_name, review):
+        rating = int(review['rating'])
+        if not 0 <= rating <= 5:
+            raise ValueError(f"Rating must be between 0 and 5, got {rating}")
+        cur = conn.execute(
+            "INSERT INTO reviews (id, exec_name, rating, review, timestamp, reviewer, is_current_employee, relationship)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                review.get('id'), exec_name, rating, review['review'],
+                review.get('timestamp', ''), review.get('reviewer'),
+                review.get('is_current_employee'), review.get('relationship'),
+            ),
+        )
+        key = reviewer_key(review)
+        conn.execute(
+            "INSERT INTO exec_reviewers (exec_name, reviewer, n) VALUES (?, ?, 1)"
+            " ON CONFLICT (exec_name, reviewer) DO UPDATE SET n = n + 1",
+            (exec_name, key),
+        )
+        first_review = conn.execute(
+            "SELECT n FROM exec_reviewers WHERE exec_name = ? AND reviewer = ?", (exec_name, key)
+        ).fetchone()[0] == 1
+        conn.execute(
+            "INSERT INTO reviewer_stats (reviewer, n) VALUES (?, 1) ON CONFLICT (reviewer) DO UPDATE SET n = n + 1",
+            (key,),
+        )
+        bucket = HISTOGRAM[rating]
+        conn.execute(
+            f"INSERT INTO exec_stats (exec_name, count, rating_sum, {bucket}, distinct_reviewers)"
+            " VALUES (?, 1, ?, 1, ?)"
+            f" ON CONFLICT (exec_name) DO UPDATE SET count = count + 1, rating_sum = rating_sum + excluded.rating_sum,"
+            f" {bucket} = {bucket} + 1, distinct_reviewers = distinct_reviewers + excluded.distinct_reviewers",
+            (exec_name, rating, int(first_review)),
+        )
+        for sql in ROLLUP_ADD_SQL:
+            conn.execute(sql, (cur.lastrowid,))
+        return dict(review, id=cur.lastrowid)
+
+    def add_review(self, exec_name, review):
+        review = {k: v for k, v in review.items() if k != 'id'}
+        with self._conn() as conn:
+            return self._insert(conn, exec_name, review)
+
+    def migrate_from_json(self, data_dir=DATA_DIR):
+        """One-shot import of exec_reviews.json (and any pending log records).
+
+        Review ids are preserved. Runs at most once per database; later calls
+        are a no-op.
+        """
+        from reviews.log import ReviewLog
+        with self._conn() as conn:
+            # Take the write lock before checking, so processes opening a
+            # fresh database at the same time import it only once.
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from_json'").fetchone():
+                return 0
+            imported = 0
+            for exec_name, review in ReviewLog(data_dir).iter_reviews():
+                self._insert(conn, exec_name, review)
+                imported += 1
+            conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_from_json', ?)", (str(imported),))
+        return imported
+
+    def iter_reviews(self):
+        for row in self._conn().execute("SELECT * FROM reviews ORDER BY id"):
+            yield row['exec_name'], _row_to_review(row)
+
+    def count_reviews(self, exec_name):
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM reviews WHERE exec_name = ?", (exec_name,)
+        ).fetchone()[0]
+
+    def reviews_page(self, exec_name, limit, before=None, after=None):
+        conn = self._conn()
+        # Keyset pagination over idx_reviews_exec: cost is independent of depth.
+        if after is not None:
+            rows = conn.execute(
+                "SELECT * FROM reviews WHERE exec_name = ? AND id > ? ORDER BY id ASC LIMIT ?",
+                (exec_name, after, limit + 1),
+            ).fetchall()
+            has_newer, rows = len(rows) > limit, rows[:limit][::-1]
+            if not has_newer and len(rows) < limit:
+                # Reached the top with a short page: show a full newest page instead.
+                return self.reviews_page(exec_name, limit)
+            has_older = bool(rows) and self._has_review(conn, exec_name, "id < ?", rows[-1]['id'])
+        else:
+            rows = conn.execute(
+                "SELECT * FROM reviews WHERE exec_name = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                (exec_name, before if before is not None else MAX_ID, limit + 1),
+            ).fetchall()
+            has_older, rows = len(rows) > limit, rows[:limit]
+            has_newer = bool(rows) and before is not None and self._has_review(conn, exec_name, "id > ?", rows[0]['id'])
+        reviews = [_row_to_review(row) for row in rows]
+        return ReviewPage(
+            reviews,
+            reviews[-1]['id'] if has_older else None,
+            reviews[0]['id'] if has_newer else None,
+        )
+
+    def _has_review(self, conn, exec_name, condition, review_id):
+        return conn.execute(
+            f"SELECT 1 FROM reviews WHERE exec_name = ? AND {condition} LIMIT 1", (exec_name, review_id)
+        ).fetchone() is not None
+
+    def count_by_reviewer(self, reviewer):
+        row = self._conn().execute("SELECT n FROM reviewer_stats WHERE reviewer = ?", (reviewer,)).fetchone()
+        return row[0] if row else 0
+
+    def reviewer_activity(self, reviewer, limit=None):
+        if reviewer == 'Anonymous':
+            # Reviews without a reviewer are counted as 'Anonymous', see reviewer_key().
+            where, params = "(reviewer IS NULL OR reviewer IN ('', 'Anonymous'))", ()
+        else:
+            where, params = "reviewer = ?", (reviewer,)
+        rows = self._conn().execute(
+            f"SELECT exec_name, timestamp FROM reviews WHERE {where} ORDER BY id DESC LIMIT ?",
+            params + (-1 if limit is None else limit,),
+        )
+        return [(row['exec_name'], row['timestamp']) for row in rows]
+
+    def exec_aggregates(self, exec_name):
+        row = self._conn().execute("SELECT * FROM exec_stats WHERE exec_name = ?", (exec_name,)).fetchone()
+        return _stats_from_row(row)
+
+    def rating_rollups(self, exec_name, grain='week', since=None):
+        rows = self._conn().execute(
+            "SELECT * FROM exec_rollups WHERE exec_name = ? AND grain = ? AND bucket >= ? ORDER BY bucket",
+            (exec_name, grain, since or ''),
+        )
+        return [_row_to_rollup(row) for row in rows]
+
+    def _all_stats(self, conn):
+        stats = {row['exec_name']: [_stats_from_row(row), set()] for row in conn.execute("SELECT * FROM exec_stats")}
+        for row in conn.execute("SELECT * FROM exec_rollups"):
+            stats.setdefault(row['exec_name'], [None, set()])[1].add(tuple(row))
+        return stats
+
+    def rebuild_aggregates(self):
+        conn = self._conn()
+        before = self._all_stats(conn)
+        # executescript() commits any pending transaction first, so wrap the
+        # rebuild explicitly to keep readers from seeing empty tables.
+        conn.executescript("BEGIN IMMEDIATE;" + REBUILD_SQL + "COMMIT;")
+        after = self._all_stats(conn)
+        return sorted(name for name in set(before) | set(after) if before.get(name) != after.get(name))
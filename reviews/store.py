@@ -0,0 +1,202 @@
+import bisect
+import os
+import re
+import threading
+from collections import namedtuple
+from datetime import date, timedelta
+from functools import lru_cache
+
+from settings import DATA_DIR
+
+REVIEW_BACKEND = os.environ.get('STICKYNOTE_REVIEW_BACKEND', 'sqlite')
+
+# One page of reviews, newest first. ``older`` / ``newer`` are the cursors to
+# pass back as ``before=`` / ``after=`` for the neighbouring pages, or None at
+# either end of the feed.
+ReviewPage = namedtuple('ReviewPage', ['reviews', 'older', 'newer'])
+
+# Rating histogram of the reviews in one time bucket for one (relationship,
+# current-employee) combination. ``bucket`` is the ISO date of the day, or of
+# the Monday starting the week; unset fields are None.
+RollupRow = namedtuple('RollupRow', ['bucket', 'relationship', 'is_current_employee', 'histogram'])
+
+GRAINS = ('day', 'week')
+RECENT_DAYS = 30
+
+_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+class ReviewStore:
+    """Interface shared by the review backends.
+
+    Reviews are plain dicts (``rating``, ``review``, ``timestamp``,
+    ``reviewer`` and optionally ``is_current_employee`` / ``relationship``)
+    plus an ``id`` assigned by the store in insertion order.
+    """
+
+    def add_review(self, exec_name, review):
+        """Persist a review for an executive and return it with its id."""
+        raise NotImplementedError
+
+    def iter_reviews(self):
+        """Yield ``(exec_name, review)`` for every review, oldest first."""
+        raise NotImplementedError
+
+    def count_reviews(self, exec_name):
+        raise NotImplementedError
+
+    def reviews_page(self, exec_name, limit, before=None, after=None):
+        """Return a ``ReviewPage`` of up to ``limit`` reviews, newest first.
+
+        Cursors are review ids, which only ever grow, so pages stay stable
+        while new reviews arrive. With neither cursor the newest page is
+        returned; ``before`` pages towards older reviews, ``after`` towards
+        newer ones.
+        """
+        raise NotImplementedError
+
+    def count_by_reviewer(self, reviewer):
+        """Number of reviews written by ``reviewer`` across all executives."""
+        raise NotImplementedError
+
+    def reviewer_activity(self, reviewer, limit=None):
+        """``(exec_name, timestamp)`` for each review by ``reviewer``, newest first."""
+        raise NotImplementedError
+
+    def exec_aggregates(self, exec_name):
+        """Rating statistics for one executive, see ``make_stats``."""
+        raise NotImplementedError
+
+    def rebuild_aggregates(self):
+        """Recompute the maintained aggregates from the raw reviews.
+
+        Returns the executives whose maintained aggregates disagreed with the
+        recomputed ones.
+        """
+        raise NotImplementedError
+
+    def rating_rollups(self, exec_name, grain='week', since=None):
+        """``RollupRow``s for one executive at ``grain`` ('day' or 'week'), oldest bucket first.
+
+        Only reviews with a dated ``timestamp`` are rolled up. ``since`` is an
+        ISO date; buckets before it are skipped.
+        """
+        raise NotImplementedError
+
+    def recent_stats(self, exec_name, days=RECENT_DAYS, today=None):
+        """Rating statistics for the reviews of the last ``days`` days, from the daily rollups."""
+        since = (today or date.today()) - timedelta(days=days - 1)
+        return rollup_stats(self.rating_rollups(exec_name, 'day', since.isoformat()))
+
+
+def reviewer_key(review):
+    return review.get('reviewer') or 'Anonymous'
+
+
+def make_stats(count, rating_sum, histogram, unique_reviewers):
+    """Scorecard statistics from a rating histogram indexed by star rating (0-5)."""
+    return {
+        'count': count,
+        'rating_sum': rating_sum,
+        'avg_rating': rating_sum / count if count else None,
+        'histogram': list(histogram),
+        'positive': histogram[4] + histogram[5],
+        'neutral': histogram[3],
+        'negative': histogram[0] + histogram[1] + histogram[2],
+        'unique_reviewers': unique_reviewers,
+    }
+
+
+class RatingAggregate:
+    """Running rating statistics for one executive, updated one review at a time."""
+
+    __slots__ = ('count', 'rating_sum', 'histogram', 'reviewers')
+
+    def __init__(self):
+        self.count = 0
+        self.rating_sum = 0
+        self.histogram = [0] * 6
+        self.reviewers = {}
+
+    def add(self, review):
+        rating = int(review['rating'])
+        self.count += 1
+        self.rating_sum += rating
+        self.histogram[rating] += 1
+        key = reviewer_key(review)
+        self.reviewers[key] = self.reviewers.get(key, 0) + 1
+
+    def stats(self):
+        return make_stats(self.count, self.rating_sum, self.histogram, len(self.reviewers))
+
+
+def rollup_buckets(timestamp):
+    """``(day, week)`` bucket keys for a review timestamp, or None if it has no date."""
+    if not timestamp or not _DATE.match(timestamp):
+        return None
+    try:
+        day = date.fromisoformat(timestamp[:10])
+    except ValueError:
+        return None
+    return day.isoformat(), (day - timedelta(days=day.weekday())).isoformat()
+
+
+def rollup_stats(rows):
+    """Combined scorecard statistics for some ``RollupRow``s (reviewers are not tracked)."""
+    histogram = [sum(counts) for counts in zip(*(row.histogram for row in rows))] or [0] * 6
+    return make_stats(sum(histogram), sum(i * n for i, n in enumerate(histogram)), histogram, None)
+
+
+class RatingRollups:
+    """Running day and week rollups for one executive, updated one review at a time."""
+
+    __slots__ = ('cells', 'buckets')
+
+    def __init__(self):
+        self.cells = {grain: {} for grain in GRAINS}  # grain -> bucket -> (relationship, current) -> histogram
+        self.buckets = {grain: [] for grain in GRAINS}  # sorted bucket keys
+
+    def add(self, review):
+        keys = rollup_buckets(review.get('timestamp'))
+        if keys is None:
+            return
+        split = (review.get('relationship'), review.get('is_current_employee'))
+        for grain, bucket in zip(GRAINS, keys):
+            cells = self.cells[grain]
+            if bucket not in cells:
+                cells[bucket] = {}
+                bisect.insort(self.buckets[grain], bucket)
+            cells[bucket].setdefault(split, [0] * 6)[int(review['rating'])] += 1
+
+    def rows(self, grain, since=None):
+        buckets = self.buckets[grain]
+        start = bisect.bisect_left(buckets, since) if since else 0
+        cells = self.cells[grain]
+        return [
+            RollupRow(bucket, relationship, current, list(histogram))
+            for bucket in buckets[start:]
+            for (relationship, current), histogram in cells[bucket].items()
+        ]
+
+
+_store_lock = threading.Lock()
+
+
+def get_review_store(backend=REVIEW_BACKEND, data_dir=DATA_DIR):
+    """Process-wide review store for the configured backend ('sqlite' or 'log')."""
+    # lru_cache alone lets concurrent first calls each open (and migrate) a store.
+    with _store_lock:
+        return _open_review_store(backend, data_dir)
+
+
+@lru_cache(maxsize=None)
+def _open_review_store(backend, data_dir):
+    if backend == 'log':
+        from reviews.log import ReviewLog
+        return ReviewLog(data_dir)
+    if backend == 'sqlite':
+        from reviews.sqlite_store import SqliteReviewStore
+        store = SqliteReviewStore(os.path.join(data_dir, 'exec_reviews.db'))
+        store.migrate_from_json(data_dir)
+        return store
+    raise ValueError(f"Unknown review backend: {backend}")
@@ -0,0 +1,5 @@
+import os
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.environ.get('STICKYNOTE_DATA_DIR', os.path.join(ROOT_DIR, 'data'))
+CACHE_DIR = os.environ.get('STICKYNOTE_CACHE_DIR', os.path.join(ROOT_DIR, '.cache'))
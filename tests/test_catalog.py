@@ -0,0 +1,29 @@
+import pytest
+
+from companies.catalog import CompanyCatalog
+
+
+@pytest.fixture
+def catalog():
+    return CompanyCatalog({
+        'AAPL': "Apple", 'BRK.B': "Berkshire Hathaway", 'BRKR': "Bruker",
+        'BF.B': "Brown-Forman", 'MSFT': "Microsoft",
+    })
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('BRK.B', ['BRK.B']),
+    ('brk.', ['BRK.B']),
+    (' bf.b ', ['BF.B']),
+    ('BRK', ['BRK.B', 'BRKR']),
+    ('aapl', ['AAPL']),
+])
+def test_ticker_queries(catalog, query, expected):
+    assert catalog.search(query) == expected
+
+
+def test_name_queries(catalog):
+    assert catalog.search('berkshire hathaway') == ['BRK.B']
+    assert catalog.search('microsft') == ['MSFT']  # one typo
+    assert catalog.search('brown forman') == ['BF.B']
+    assert catalog.search('   ') == []
@@ -0,0 +1,47 @@
+import pytest
+
+from org import chart
+from org.chart import collapse_tree, get_company_chart
+from org.directory import ExecutiveDirectory
+from utils import LRUCache
+
+
+@pytest.fixture
+def directory():
+    # A CEO over 10 VPs, each over 10 managers, each over 5 staff.
+    executives = {'CEO': {'title': 'CEO', 'direct_reports': []}}
+    for v in range(10):
+        vp = f'VP {v}'
+        executives['CEO']['direct_reports'].append(vp)
+        executives[vp] = {'title': 'VP', 'reports_to': 'CEO', 'direct_reports': []}
+        for m in range(10):
+            manager = f'Manager {v}.{m}'
+            executives[vp]['direct_reports'].append(manager)
+            executives[manager] = {'title': 'Manager', 'reports_to': vp,
+                                   'direct_reports': [f'Staff {v}.{m}.{s}' for s in range(5)]}
+            for s in range(5):
+                executives[f'Staff {v}.{m}.{s}'] = {'title': 'Staff', 'reports_to': manager}
+    return ExecutiveDirectory('TEST', executives, version=1)
+
+
+@pytest.mark.parametrize('budget', [5, 50, 200, 600])
+def test_collapse_tree_counts_aggregate_nodes(directory, budget):
+    assert len(collapse_tree(directory.hierarchy, budget=budget)) <= budget
+
+
+def _selected(figure):
+    return [list(c) for c in figure.data[-1].customdata]
+
+
+def test_selecting_a_drawn_executive_reuses_the_chart(directory, monkeypatch):
+    monkeypatch.setattr(chart, '_company_cache', LRUCache(chart.COMPANY_CHART_CACHE_SIZE))
+    first = get_company_chart(directory, 'CEO', budget=50)
+    second = get_company_chart(directory, 'VP 3', budget=50)
+    assert len(chart._company_cache) == 1
+    assert _selected(first) == [['exec', 'CEO']] and _selected(second) == [['exec', 'VP 3']]
+
+
+def test_selecting_a_folded_executive_expands_its_managers(directory):
+    figure = get_company_chart(directory, 'Staff 7.2.4', budget=50)
+    assert ['exec', 'Staff 7.2.4'] in [list(c) for c in figure.data[1].customdata]
+    assert _selected(figure) == [['exec', 'Staff 7.2.4']]
@@ -0,0 +1,23 @@
+from org.directory import ExecutiveDirectory
+
+
+def _directory(reports):
+    return ExecutiveDirectory('TEST', {name: {'direct_reports': r} for name, r in reports.items()})
+
+
+def test_total_reports_count_every_level():
+    index = _directory({'A': ['B', 'C'], 'B': ['D', 'Unlisted'], 'C': [], 'D': []}).hierarchy
+    assert [index.stats(name)['total_reports'] for name in 'ABCD'] == [4, 2, 0, 0]
+    assert index.stats('A')['subtree_size'] == 4
+
+
+def test_cycle_members_do_not_count_themselves():
+    index = _directory({'A': ['B'], 'B': ['C'], 'C': ['A']}).hierarchy
+    assert [index.stats(name)['total_reports'] for name in 'ABC'] == [2, 1, 0]
+    assert index.cycles == [['A', 'B', 'C']]
+    assert index.stats('C')['direct_reports'] == 1
+
+
+def test_self_report_is_not_counted():
+    index = _directory({'A': ['A', 'B'], 'B': []}).hierarchy
+    assert index.stats('A')['total_reports'] == 1
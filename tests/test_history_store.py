@@ -0,0 +1,87 @@
+import multiprocessing
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market.history import EPOCH, HistoryStore
+
+
+def fake_fetch(ticker, start, end):
+    days = pd.bdate_range(start, end - timedelta(days=1))
+    return pd.DataFrame({c: np.arange(len(days), dtype=float) for c in ['Open', 'High', 'Low', 'Close', 'Volume']},
+                        index=days)
+
+
+def _worker(directory, offset):
+    store = HistoryStore(directory, fetch=fake_fetch)
+    end = date.today()
+    for k in range(10):
+        start = end - timedelta(days=30 * ((k + offset) % 7 + 1))
+        store.get('ABC', start, end - timedelta(days=7 * (k % 3)))
+
+
+def test_get_fetches_only_missing_ranges(tmp_path):
+    calls = []
+    store = HistoryStore(tmp_path, fetch=lambda *args: calls.append(args) or fake_fetch(*args))
+    end = date.today() - timedelta(days=10)
+    first = store.get('ABC', end - timedelta(days=60), end)
+    again = store.get('ABC', end - timedelta(days=30), end)
+    assert len(calls) == 1
+    assert len(first) == len(pd.bdate_range(end - timedelta(days=60), end - timedelta(days=1)))
+    assert again.index.equals(first.index[-len(again):])
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_concurrent_processes_keep_ranges_and_bars_consistent(tmp_path):
+    ctx = multiprocessing.get_context('fork')
+    processes = [ctx.Process(target=_worker, args=(str(tmp_path), i)) for i in range(4)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+        assert p.exitcode == 0
+    assert not list(tmp_path.glob('*.tmp'))
+
+    meta, bars = HistoryStore(tmp_path)._read('ABC')
+    stored = set(bars['day'].tolist())
+    for lo, hi in meta['ranges']:
+        expected = pd.bdate_range(EPOCH + timedelta(days=lo), EPOCH + timedelta(days=hi - 1))
+        assert {(d.date() - EPOCH).days for d in expected} <= stored
+
+
+def test_empty_range_before_the_first_bar_is_not_refetched(tmp_path):
+    end = date.today() - timedelta(days=10)
+    listed = end - timedelta(days=200)
+    calls = []
+
+    def recently_listed(ticker, start, end):
+        calls.append((start, end))
+        return fake_fetch(ticker, max(start, listed), end) if end > listed else fake_fetch(ticker, start, start)
+
+    store = HistoryStore(tmp_path, fetch=recently_listed)
+    one_year = store.get('NEW', end - timedelta(days=365), end)
+    five_years = store.get('NEW', end - timedelta(days=5 * 365), end)
+    assert five_years.index.equals(one_year.index)
+    store.get('NEW', end - timedelta(days=5 * 365), end)
+    store.get('NEW', end - timedelta(days=365), end)
+    assert len(calls) == 2
+
+
+def test_empty_gap_between_bars_stays_unfilled(tmp_path):
+    end = date.today() - timedelta(days=10)
+    outage = (end - timedelta(days=40), end - timedelta(days=20))
+    calls = []
+
+    def flaky(ticker, start, end):
+        calls.append((start, end))
+        frame = fake_fetch(ticker, start, end)
+        return frame[(frame.index < pd.Timestamp(outage[0])) | (frame.index >= pd.Timestamp(outage[1]))]
+
+    store = HistoryStore(tmp_path, fetch=flaky)
+    store.get('ABC', end - timedelta(days=60), end - timedelta(days=40))
+    store.get('ABC', end - timedelta(days=20), end)
+    store.get('ABC', end - timedelta(days=60), end)
+    store.get('ABC', end - timedelta(days=60), end)
+    assert calls[2:] == [outage, outage]
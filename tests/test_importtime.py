@@ -0,0 +1,12 @@
+import pytest
+
+from tools.importtime import load_budget, measure, summarize
+
+pytest.importorskip('streamlit')
+
+
+@pytest.mark.parametrize('entry', ['login', 'home'])
+def test_entry_point_skips_forbidden_packages(entry):
+    # Only the deterministic half of the budget; max_ms is checked by the CLI.
+    _, packages, _ = summarize(measure(entry))
+    assert sorted(set(load_budget()[entry]['forbidden']) & set(packages)) == []
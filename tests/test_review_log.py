@@ -0,0 +1,89 @@
+import json
+import os
+
+import pytest
+
+import reviews.log
+from reviews.log import ReviewLog
+
+
+def _review(n):
+    return {'rating': 4, 'review': f"review {n}", 'timestamp': '2025-06-09 14:22', 'reviewer': 'A'}
+
+
+def test_reviews_survive_a_reload(tmp_path):
+    log = ReviewLog(tmp_path)
+    for n in range(3):
+        log.add_review('X', _review(n))
+    assert [r['id'] for r in ReviewLog(tmp_path).reviews_for('X')] == [1, 2, 3]
+
+
+def test_crash_between_snapshot_and_log_truncation(tmp_path, monkeypatch):
+    log = ReviewLog(tmp_path)
+    for n in range(3):
+        log.add_review('X', _review(n))
+
+    # Die right after the snapshot is replaced, before the log is.
+    replace = os.replace
+
+    def crashing_replace(src, dst):
+        if dst == log.log_path:
+            raise OSError("crashed")
+        replace(src, dst)
+
+    monkeypatch.setattr(os, 'replace', crashing_replace)
+    with pytest.raises(OSError):
+        log.compact()
+    monkeypatch.undo()
+
+    reopened = ReviewLog(tmp_path)
+    assert reopened.count_reviews('X') == 3
+    assert [r['id'] for r in reopened.reviews_for('X')] == [1, 2, 3]
+    assert reopened.exec_aggregates('X')['count'] == 3
+    assert reopened.add_review('X', _review(3))['id'] == 4
+    assert [r['id'] for r in ReviewLog(tmp_path).reviews_for('X')] == [1, 2, 3, 4]
+
+
+def test_compaction_keeps_reviews(tmp_path):
+    log = ReviewLog(tmp_path, compact_every=2)
+    for n in range(5):
+        log.add_review('X', _review(n))
+    log._compactor.join()
+    reopened = ReviewLog(tmp_path)
+    assert [r['id'] for r in reopened.reviews_for('X')] == [1, 2, 3, 4, 5]
+    assert reopened.rebuild_aggregates() == []
+
+
+def test_add_review_leaves_compaction_to_a_background_thread(tmp_path, monkeypatch):
+    log = ReviewLog(tmp_path, compact_every=3)
+    dumped, dump = [], json.dump
+    monkeypatch.setattr(reviews.log.json, 'dump', lambda *args, **kwargs: dumped.append(1) or dump(*args, **kwargs))
+    for n in range(2):
+        log.add_review('X', _review(n))
+    assert log._compactor is None
+    log.add_review('X', _review(2))
+    log._compactor.join()
+    assert dumped == [1]
+    assert os.path.getsize(log.log_path) == 0
+    with open(log.snapshot_path) as f:
+        assert [r['id'] for r in json.load(f)['X']] == [1, 2, 3]
+
+
+def test_reviews_added_while_compacting_stay_in_the_log(tmp_path, monkeypatch):
+    log = ReviewLog(tmp_path)
+    log.add_review('X', _review(0))
+    dump = json.dump
+
+    def dump_while_another_process_writes(*args, **kwargs):
+        ReviewLog(tmp_path).add_review('Y', _review(1))
+        dump(*args, **kwargs)
+
+    monkeypatch.setattr(reviews.log.json, 'dump', dump_while_another_process_writes)
+    log.compact()
+    monkeypatch.undo()
+    with open(log.snapshot_path) as f:
+        assert list(json.load(f)) == ['X']
+    assert [r['id'] for r in log.reviews_for('Y')] == [2]
+    reopened = ReviewLog(tmp_path)
+    assert [(name, r['id']) for name, r in reopened.iter_reviews()] == [('X', 1), ('Y', 2)]
+    assert reopened.add_review('X', _review(2))['id'] == 3
@@ -0,0 +1,110 @@
+import threading
+
+from reviews.log import ReviewLog
+from reviews.sqlite_store import SqliteReviewStore
+
+
+def _review(n, timestamp='2025-06-09 14:22', reviewer='A', rating=4):
+    return {'rating': rating, 'review': f"review {n}", 'timestamp': timestamp, 'reviewer': reviewer}
+
+
+def _store(tmp_path):
+    return SqliteReviewStore(str(tmp_path / 'exec_reviews.db'))
+
+
+def test_concurrent_first_opens_migrate_once(tmp_path):
+    log = ReviewLog(tmp_path)
+    for n in range(200):
+        log.add_review('X', _review(n))
+
+    errors, barrier = [], threading.Barrier(4)
+
+    def open_store():
+        store = _store(tmp_path)
+        barrier.wait()
+        try:
+            store.migrate_from_json(tmp_path)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=open_store) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert _store(tmp_path).count_reviews('X') == 200
+
+
+def _ids(page):
+    return [r['id'] for r in page.reviews]
+
+
+def test_keyset_paging_both_ways(tmp_path):
+    store = _store(tmp_path)
+    for n in range(7):
+        store.add_review('X', _review(n))
+        store.add_review('Y', _review(n))  # interleaved, so X's ids are not contiguous
+    x_ids = [r['id'] for r in store.reviews_page('X', 100).reviews]
+    assert len(x_ids) == 7
+
+    newest = store.reviews_page('X', 3)
+    assert _ids(newest) == x_ids[:3] and newest.newer is None and newest.older == x_ids[2]
+    middle = store.reviews_page('X', 3, before=newest.older)
+    assert _ids(middle) == x_ids[3:6] and middle.newer == x_ids[3] and middle.older == x_ids[5]
+    oldest = store.reviews_page('X', 3, before=middle.older)
+    assert _ids(oldest) == x_ids[6:] and oldest.older is None and oldest.newer == x_ids[6]
+
+    assert store.reviews_page('X', 3, after=oldest.newer) == middle
+    # Only two reviews are newer than x_ids[2]: the newest full page is shown instead.
+    assert store.reviews_page('X', 3, after=x_ids[2]) == newest
+
+
+def test_pages_are_stable_while_reviews_arrive(tmp_path):
+    store = _store(tmp_path)
+    for n in range(6):
+        store.add_review('X', _review(n))
+    first = store.reviews_page('X', 3)
+    for n in range(6, 10):
+        store.add_review('X', _review(n))
+    second = store.reviews_page('X', 3, before=first.older)
+    assert _ids(second) == [3, 2, 1] and second.older is None
+    assert second.newer == 3
+    assert _ids(store.reviews_page('X', 3, after=second.newer)) == [6, 5, 4]
+
+
+def test_maintained_aggregates_match_a_rebuild(tmp_path):
+    store = _store(tmp_path)
+    store.add_review('X', _review(0, '2025-06-09 10:00', 'A', 5))
+    store.add_review('X', _review(1, '2025-06-10 10:00', 'A', 2))
+    store.add_review('X', _review(2, '2025-06-16 10:00', 'B', 4))
+    store.add_review('X', _review(3, '', None, 0))
+    store.add_review('Y', _review(4, '2025-06-09 10:00', 'B', 3))
+
+    stats = store.exec_aggregates('X')
+    assert stats['count'] == 4 and stats['rating_sum'] == 11
+    assert stats['histogram'] == [1, 0, 1, 0, 1, 1] and stats['unique_reviewers'] == 3
+    assert store.count_by_reviewer('A') == 2 and store.count_by_reviewer('B') == 2
+    assert store.count_by_reviewer('Anonymous') == 1
+    weeks = store.rating_rollups('X', 'week')
+    assert [(row.bucket, row.histogram) for row in weeks] == [
+        ('2025-06-09', [0, 0, 1, 0, 0, 1]), ('2025-06-16', [0, 0, 0, 0, 1, 0]),
+    ]
+    assert [row.bucket for row in store.rating_rollups('X', 'day', since='2025-06-10')] == ['2025-06-10', '2025-06-16']
+    assert store.rebuild_aggregates() == []
+
+
+def test_migrate_from_json_keeps_ids_once(tmp_path):
+    log = ReviewLog(tmp_path)
+    expected = {'X': [], 'Y': []}
+    for n in range(6):
+        name = 'XY'[n % 2]
+        expected[name].append(log.add_review(name, _review(n))['id'])
+
+    store = _store(tmp_path)
+    assert store.migrate_from_json(tmp_path) == 6
+    assert store.migrate_from_json(tmp_path) == 0
+    for name, ids in expected.items():
+        assert _ids(store.reviews_page(name, 10)) == ids[::-1]
+    assert store.add_review('X', _review(6))['id'] == 7
+    assert store.rebuild_aggregates() == []
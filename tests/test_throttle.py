@@ -0,0 +1,111 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from market.throttle import ProviderGate, TokenBucket
+
+
+class FakeProvider:
+    """Counts calls and tracks how many run at once; ``release`` holds calls until set."""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.release = threading.Event()
+        self.release.set()
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def info(self, ticker):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            self.release.wait(5)
+            time.sleep(self.delay)
+            if self.error:
+                raise self.error
+            return {'symbol': ticker}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _call_concurrently(gate, provider, keys):
+    """Call the gate from one thread per key while the provider is held, then release it."""
+    provider.release.clear()
+    with ThreadPoolExecutor(max_workers=len(keys)) as pool:
+        futures = [pool.submit(gate.call, ('info', key), provider.info, key) for key in keys]
+        _wait_for(lambda: gate.flights.shared + provider.calls >= len(keys))
+        provider.release.set()
+    return futures
+
+
+def test_concurrent_callers_for_one_key_share_one_call():
+    gate, provider = ProviderGate(concurrency=8, rate=1000, burst=1000), FakeProvider()
+    futures = _call_concurrently(gate, provider, ['AAPL'] * 20)
+    assert provider.calls == 1
+    assert [f.result() for f in futures] == [{'symbol': 'AAPL'}] * 20
+    assert gate.flights.executions == 1 and gate.flights.shared == 19
+
+
+def test_concurrent_callers_all_get_the_exception():
+    gate, provider = ProviderGate(concurrency=8, rate=1000, burst=1000), FakeProvider(error=ValueError("boom"))
+    futures = _call_concurrently(gate, provider, ['AAPL'] * 10)
+    assert provider.calls == 1
+    for future in futures:
+        with pytest.raises(ValueError, match="boom"):
+            future.result()
+    # Nothing stays in flight: the next call goes to the provider again.
+    with pytest.raises(ValueError):
+        gate.call(('info', 'AAPL'), provider.info, 'AAPL')
+    assert provider.calls == 2
+
+
+def test_different_keys_are_not_coalesced():
+    gate, provider = ProviderGate(concurrency=8, rate=1000, burst=1000), FakeProvider()
+    futures = _call_concurrently(gate, provider, ['AAPL', 'MSFT', 'GOOG'])
+    assert provider.calls == 3
+    assert [f.result()['symbol'] for f in futures] == ['AAPL', 'MSFT', 'GOOG']
+
+
+def test_semaphore_caps_concurrent_calls():
+    gate, provider = ProviderGate(concurrency=3, rate=1000, burst=1000), FakeProvider(delay=0.02)
+    keys = [f'T{i}' for i in range(12)]
+    with ThreadPoolExecutor(max_workers=len(keys)) as pool:
+        results = list(pool.map(lambda key: gate.call(('info', key), provider.info, key), keys))
+    assert provider.calls == 12
+    assert provider.max_active == 3
+    assert [r['symbol'] for r in results] == keys
+
+
+def test_token_bucket_respects_rate():
+    bucket = TokenBucket(rate=50, capacity=5)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05  # the burst is banked
+    for _ in range(10):
+        bucket.acquire()
+    assert time.monotonic() - start >= 10 / 50 * 0.9
+
+
+def test_gate_rate_limits_provider_calls():
+    gate, provider = ProviderGate(concurrency=8, rate=40, burst=1), FakeProvider()
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda key: gate.call(('info', key), provider.info, key), [f'T{i}' for i in range(9)]))
+    assert provider.calls == 9
+    assert time.monotonic() - start >= 8 / 40 * 0.9
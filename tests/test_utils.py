@@ -0,0 +1,19 @@
+from utils import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now the oldest
+    assert cache.put('c', 3) == 1
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c'), len(cache)) == (1, 3, 2)
+
+
+def test_get_or_build_builds_once():
+    cache, calls = LRUCache(4), []
+    build = lambda x: calls.append(x) or x * 2
+    assert cache.get_or_build('k', build, 21) == 42
+    assert cache.get_or_build('k', build, 21) == 42
+    assert calls == [21]
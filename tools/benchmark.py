@@ -0,0 +1,259 @@
+"""Rerun-latency benchmarks for the app's pages, driven headlessly with Streamlit's AppTest.
+
+    python -m tools.benchmark                        # run every scenario and compare with the baseline
+    python -m tools.benchmark --scale small home     # a subset: scales and/or pages
+    python -m tools.benchmark --threshold 1.0        # allow 100% over the baseline
+    python -m tools.benchmark --update-baseline      # store the results as the new baseline
+
+Each scale is a synthetic dataset: a company catalog of ``tickers`` companies,
+executive files for the first few of them with ``executives`` each, and
+``reviews`` reviews for each of their top executives. Datasets are generated
+under ``--workdir`` (reused while their parameters match) and prepared with
+the app's own jobs: the market warm-up on the synthetic provider, the
+executive snapshot and the review store migration.
+
+Every (scale, page) scenario runs in a fresh interpreter pointed at its
+dataset through the ``STICKYNOTE_*`` settings: one untimed run to load the
+page, then ``--reruns`` timed reruns of app.py with the same session. p50 and
+p95 rerun times and the process's peak RSS are compared with
+tools/benchmark_baseline.json (with ``--repeat``, the medians over several
+interpreters). Like the import-time budget, the baseline is only meaningful
+on the machine that recorded it.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import date, timedelta
+
+from settings import ROOT_DIR
+
+BASELINE_PATH = os.path.join(ROOT_DIR, 'tools', 'benchmark_baseline.json')
+SCALES = {
+    'small': {'tickers': 50, 'executives': 40, 'reviews': 20},
+    'medium': {'tickers': 200, 'executives': 400, 'reviews': 300},
+    'large': {'tickers': 500, 'executives': 4000, 'reviews': 3000},
+}
+PAGES = ['home', 'company_page', 'executive_detail', 'leaderboard']
+COMPANIES_WITH_EXECUTIVES = 3
+REVIEWED_EXECUTIVES = 10  # per company, the top of the org chart
+RERUNS = 20
+THRESHOLD = 0.5
+# Differences below these are noise, whatever the relative change
+MIN_DELTA = {'p50_ms': 10, 'p95_ms': 20, 'peak_mb': 20}
+RELATIONSHIPS = ["Direct Report", "Indirect Report", "Peer", "Manager", "No Direct Relationship"]
+
+
+def generate_dataset(root, tickers, executives, reviews, seed=0):
+    """Write a synthetic catalog, executive files and reviews under ``root``."""
+    rng = random.Random(seed)
+    data_dir = os.path.join(root, 'data')
+    os.makedirs(data_dir, exist_ok=True)
+    with open(os.path.join(ROOT_DIR, 'sp500_companies.json'), 'r') as f:
+        real = list(json.load(f).items())
+    catalog = dict(real[:tickers])
+    for i in range(len(catalog), tickers):
+        catalog[f'ZZ{i:04d}'] = f"Synthetic Company {i}"
+    with open(os.path.join(root, 'companies.json'), 'w') as f:
+        json.dump(catalog, f, indent=2)
+
+    all_reviews = {}
+    today = date.today()
+    for ticker in list(catalog)[:COMPANIES_WITH_EXECUTIVES]:
+        names = [f"{ticker.title()} Executive {i}" for i in range(executives)]
+        org = {}
+        for i, name in enumerate(names):
+            manager = names[(i - 1) // 6] if i else None
+            org[name] = {
+                'title': "Chief Executive Officer" if i == 0 else f"Vice President {i}",
+                'reports_to': manager,
+                'direct_reports': names[6 * i + 1:6 * i + 7],
+                'bio': f"{name} leads a team at {catalog[ticker]}.",
+                'role_tag': 'CEO' if i == 0 else 'VP',
+                'shares': rng.randrange(1000, 500000),
+                'salary': rng.randrange(200000, 5000000),
+                'history': [
+                    {'title': "Director", 'start': str(2000 + k), 'duration': "1 year", 'company': ticker}
+                    for k in range(rng.randrange(1, 6))
+                ],
+            }
+        with open(os.path.join(data_dir, f'{ticker.lower()}_executives.json'), 'w') as f:
+            json.dump(org, f)
+        for name in names[:REVIEWED_EXECUTIVES]:
+            all_reviews[name] = [
+                {
+                    'rating': rng.randint(1, 5),
+                    'review': f"Review {k} of {name}.\nSecond line.",
+                    'timestamp': f"{today - timedelta(days=rng.randrange(730))} {rng.randrange(24):02d}:00",
+                    'reviewer': f"Reviewer {rng.randrange(200)}",
+                    'is_current_employee': rng.random() < 0.5,
+                    'relationship': rng.choice(RELATIONSHIPS),
+                }
+                for k in range(reviews)
+            ]
+    with open(os.path.join(data_dir, 'exec_reviews.json'), 'w') as f:
+        json.dump(all_reviews, f)
+    return catalog
+
+
+def dataset_env(root):
+    return dict(
+        os.environ,
+        PYTHONPATH=ROOT_DIR,
+        STICKYNOTE_DATA_DIR=os.path.join(root, 'data'),
+        STICKYNOTE_CACHE_DIR=os.path.join(root, 'cache'),
+        STICKYNOTE_COMPANIES_FILE=os.path.join(root, 'companies.json'),
+        STICKYNOTE_MARKET_PROVIDER='synthetic',
+        STICKYNOTE_PROVIDER_RATE='100000',
+        STICKYNOTE_PROVIDER_BURST='100000',
+        STICKYNOTE_REVIEW_BACKEND='sqlite',
+    )
+
+
+def _run(args, env):
+    result = subprocess.run([sys.executable] + args, cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{result.stderr[-2000:]}")
+    return result.stdout
+
+
+def prepare_dataset(workdir, scale):
+    """Generate and prepare ``scale``'s dataset unless an identical one is already there."""
+    params = dict(SCALES[scale], companies_with_executives=COMPANIES_WITH_EXECUTIVES, reviewed=REVIEWED_EXECUTIVES)
+    root = os.path.join(workdir, scale)
+    marker = os.path.join(root, 'dataset.json')
+    try:
+        with open(marker, 'r') as f:
+            if json.load(f) == params:
+                return root
+    except (OSError, ValueError):
+        pass
+    if os.path.exists(root):
+        shutil.rmtree(root)
+    generate_dataset(root, **SCALES[scale])
+    env = dataset_env(root)
+    _run(['-m', 'market.warmup', '--years', '2'], env)
+    _run(['-m', 'org.snapshot'], env)
+    _run(['-m', 'reviews.cli', 'migrate'], env)
+    with open(marker, 'w') as f:
+        json.dump(params, f)
+    return root
+
+
+def session_for(page, root):
+    """Session state that opens ``page`` on the first company with executives, at its CEO."""
+    with open(os.path.join(root, 'companies.json'), 'r') as f:
+        ticker, name = next(iter(json.load(f).items()))
+    with open(os.path.join(root, 'data', f'{ticker.lower()}_executives.json'), 'r') as f:
+        ceo = next(iter(json.load(f)))
+    state = {'password_correct': True, 'page': page}
+    if page in ('company_page', 'executive_detail'):
+        state.update(selected_company=ticker, company_name=name, role="Viewer", selected_exec=ceo)
+    return state
+
+
+def run_scenario(page, state, reruns):
+    """Worker side: time ``reruns`` reruns of app.py on ``page``; prints a JSON result."""
+    import time
+    from streamlit.testing.v1 import AppTest
+    try:
+        import resource
+    except ImportError:  # Windows: no peak RSS
+        resource = None
+
+    at = AppTest.from_file(os.path.join(ROOT_DIR, 'app.py'), default_timeout=600)
+    at.secrets['app'] = {'password': ''}
+    for key, value in state.items():
+        at.session_state[key] = value
+    at.run()
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - start) * 1000)
+    if at.exception:
+        raise RuntimeError(f"{page} raised: {at.exception[0].value}")
+    times.sort()
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+    print(json.dumps({
+        'p50_ms': round(statistics.median(times), 1),
+        'p95_ms': round(times[min(len(times) - 1, int(len(times) * 0.95))], 1),
+        'peak_mb': round(peak_kb / 1024, 1),
+    }))
+
+
+def measure(page, root, reruns, repeat=1):
+    """Run a scenario ``repeat`` times in fresh interpreters; the median of each metric."""
+    code = f"from tools.benchmark import run_scenario; run_scenario({page!r}, {session_for(page, root)!r}, {reruns})"
+    runs = [json.loads(_run(['-c', code], dataset_env(root)).splitlines()[-1]) for _ in range(repeat)]
+    return {metric: statistics.median(run[metric] for run in runs) for metric in runs[0]}
+
+
+def compare(results, baseline, threshold):
+    """Regressions as messages: a metric over its baseline by more than ``threshold`` and ``MIN_DELTA``."""
+    failures = []
+    for scenario, metrics in results.items():
+        base = baseline.get(scenario)
+        if base is None:
+            continue
+        for metric, value in metrics.items():
+            limit = base[metric] * (1 + threshold)
+            if value > limit and value - base[metric] > MIN_DELTA[metric]:
+                failures.append(f"{scenario} {metric} {value} (baseline {base[metric]}, limit {limit:.1f})")
+    return failures
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark page reruns on synthetic datasets.")
+    parser.add_argument('pages', nargs='*', help=f"Pages to measure: {', '.join(PAGES)} (default: all)")
+    parser.add_argument('--scale', action='append', choices=list(SCALES), help="Dataset scale (repeatable; default: all)")
+    parser.add_argument('--reruns', type=int, default=RERUNS, help="Timed reruns per scenario")
+    parser.add_argument('--repeat', type=int, default=1, help="Runs per scenario; the median of each metric is used")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help="Allowed relative slowdown vs. the baseline")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help="Write these results into the baseline")
+    parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'stickynote-bench'),
+                        help="Where datasets are generated and kept between runs")
+    args = parser.parse_args(argv)
+    unknown = set(args.pages) - set(PAGES)
+    if unknown:
+        parser.error(f"unknown page(s): {', '.join(sorted(unknown))}")
+
+    results = {}
+    for scale in args.scale or SCALES:
+        root = prepare_dataset(args.workdir, scale)
+        for page in args.pages or PAGES:
+            scenario = f'{scale}/{page}'
+            results[scenario] = metrics = measure(page, root, args.reruns, args.repeat)
+            print(f"{scenario:28} p50 {metrics['p50_ms']:8.1f} ms  p95 {metrics['p95_ms']:8.1f} ms  "
+                  f"peak {metrics['peak_mb']:7.1f} MB", flush=True)
+
+    baseline = load_baseline(args.baseline)
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=4)
+            f.write('\n')
+        print(f"Updated {args.baseline}")
+        return 0
+    failures = compare(results, baseline, args.threshold)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
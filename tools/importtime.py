@@ -0,0 +1,97 @@
+"""Import-time report for the app's entry points, built on ``python -X importtime``.
+
+    python -m tools.importtime              # report
+    python -m tools.importtime --check      # exit 1 if an entry point is over budget
+
+Each entry point runs in a fresh interpreter after Streamlit itself is
+imported, so only the app's own import cost is counted. ``login`` executes
+app.py without a session, which renders the password screen and nothing
+else. Budgets live in tools/import_budget.json: ``max_ms`` for the total and
+``forbidden`` packages that must not be imported at all (the deterministic
+part of the check; timings vary between machines).
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+from settings import ROOT_DIR
+
+BUDGET_PATH = os.path.join(ROOT_DIR, 'tools', 'import_budget.json')
+MARKER = '-- importtime start --'
+ENTRY_POINTS = {
+    'login': "import runpy; runpy.run_path('app.py', run_name='__main__')",
+    'home': "import pgs.home_page",
+    'company_page': "import pgs.company_page",
+    'executive_detail': "import pgs.executive_detail",
+}
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(entry):
+    """Import ``entry`` in a fresh interpreter; returns ``{module: cumulative_us}`` for newly imported modules."""
+    code = f"import sys, streamlit; print({MARKER!r}, file=sys.stderr, flush=True); {ENTRY_POINTS[entry]}"
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f"{entry} failed to import:\n{result.stderr[-2000:]}")
+    lines = result.stderr.split(MARKER, 1)[-1].splitlines()
+    modules = {}
+    for line in lines:
+        match = _LINE.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            modules[name] = (int(cumulative), len(indent))
+    return modules
+
+
+def summarize(modules, top=8):
+    """Total ms, the top-level packages loaded, and the slowest imports."""
+    total_us = sum(cumulative for cumulative, indent in modules.values() if indent == 1)
+    packages = sorted({name.split('.')[0] for name in modules})
+    slowest = sorted(((cumulative, name) for name, (cumulative, _) in modules.items()), reverse=True)[:top]
+    return total_us / 1000, packages, [(name, us / 1000) for us, name in slowest]
+
+
+def load_budget(path=BUDGET_PATH):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report and check import time of the app's entry points.")
+    parser.add_argument('entries', nargs='*', help=f"Entry points to measure: {', '.join(ENTRY_POINTS)} (default: all)")
+    parser.add_argument('--check', action='store_true', help="Fail if an entry point exceeds its budget")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per entry point; the median total is used")
+    parser.add_argument('--budget', default=BUDGET_PATH)
+    args = parser.parse_args(argv)
+    unknown = set(args.entries) - set(ENTRY_POINTS)
+    if unknown:
+        parser.error(f"unknown entry point(s): {', '.join(sorted(unknown))}")
+    budget = load_budget(args.budget) if args.check else {}
+
+    failures = []
+    for entry in args.entries or ENTRY_POINTS:
+        runs = [summarize(measure(entry)) for _ in range(args.repeat)]
+        total = statistics.median(run[0] for run in runs)
+        _, packages, slowest = runs[-1]
+        print(f"{entry}: {total:.0f} ms, {len(packages)} packages")
+        for name, ms in slowest:
+            print(f"    {ms:8.1f} ms  {name}")
+        limits = budget.get(entry, {})
+        loaded = sorted(set(limits.get('forbidden', [])) & set(packages))
+        if loaded:
+            failures.append(f"{entry} imports {', '.join(loaded)}")
+        if 'max_ms' in limits and total > limits['max_ms']:
+            failures.append(f"{entry} took {total:.0f} ms (budget {limits['max_ms']} ms)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe mapping of at most ``maxsize`` entries, evicting the least recently used.
+
+    Shared by the process-wide caches (directories, charts, review cards,
+    market data) whose keys or values don't suit ``functools.lru_cache``.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Store ``value`` under ``key``; returns the number of entries evicted."""
+        evicted = 0
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def get_or_build(self, key, build, *args):
+        """The cached value for ``key``, or ``build(*args)`` stored under it.
+
+        ``build`` runs outside the lock, so two threads missing the same key
+        at once may both build it; the last one stored wins.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = build(*args)
+            self.put(key, value)
+        return value